@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Closed-loop HTTP load generator for the Django service (standard library only,
+so it runs offline on any machine with Python 3.9+).
+
+    python3 benchmarks/loadgen.py wait --url http://localhost:8080
+    python3 benchmarks/loadgen.py run --url http://localhost:8080 \\
+        --server-mode gthread --output benchmarks/results/gthread.json
+    python3 benchmarks/loadgen.py compare benchmarks/baselines/gthread.json \\
+        benchmarks/results/gthread.json
+
+Each scenario keeps --concurrency keep-alive connections busy for --duration
+seconds (the first --warmup seconds are discarded) and reports throughput and
+latency percentiles of the successful responses. Being closed-loop, a slow
+server also slows the offered load: compare runs made with the same settings.
+"""
+import argparse
+import http.client
+import json
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+LOGIN_PATH = '/admin/admin/login/'
+CHANGELIST_PATH = '/admin/admin/auth/user/'
+CSRF_TOKEN = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+PERCENTILES = (50, 95, 99)
+
+
+class Client:
+    """One keep-alive connection with a cookie jar"""
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.https = parts.scheme == 'https'
+        self.netloc = parts.netloc
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.timeout = timeout
+        self.cookies = {}
+        self.headers = {}
+        self.connection = None
+
+    def connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self.connection = cls(self.host, self.port, timeout=self.timeout)
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = {'Host': self.netloc, 'Accept-Encoding': 'br, gzip', **(headers or {})}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        for attempt in (1, 2):
+            try:
+                connection = self.connection or self.connect()
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server may close an idle keep-alive connection
+                # (max_requests recycling, keepalive timeout): retry once
+                self.close()
+                if attempt == 2:
+                    raise
+        self.headers = {name.lower(): value for name, value in response.getheaders()}
+        for name, value in response.getheaders():
+            if name.lower() == 'set-cookie':
+                cookie, _, rest = value.partition('=')
+                self.cookies[cookie] = rest.split(';', 1)[0]
+        if (response.getheader('Connection') or '').lower() == 'close':
+            self.close()
+        return response.status, data
+
+    def login_form(self):
+        """Start a fresh session on the admin login page; returns its CSRF token"""
+        self.cookies.clear()
+        _, body = self.request('GET', LOGIN_PATH)
+        match = CSRF_TOKEN.search(body)
+        if not match:
+            raise RuntimeError(f'No CSRF token on {LOGIN_PATH}')
+        return match.group(1).decode()
+
+    def submit_login(self, token, username, password):
+        form = urlencode({
+            'csrfmiddlewaretoken': token,
+            'username': username,
+            'password': password,
+            'next': '/admin/admin/',
+        })
+        status, _ = self.request('POST', LOGIN_PATH, form, {
+            'Content-Type': 'application/x-www-form-urlencoded',
+        })
+        return status
+
+
+@dataclass
+class Scenario:
+    """A timed request, with optional untimed per-iteration and per-connection setup"""
+    description: str
+    request: object
+    concurrency: int
+    expect: tuple = (200,)
+    prepare: object = None
+    setup: object = None
+
+
+def get(path, headers=None):
+    return lambda client, options: client.request('GET', path, headers=headers)[0]
+
+
+def login_setup(client, options):
+    if client.submit_login(client.login_form(), options.username, options.password) != 302:
+        raise RuntimeError(f'Login as {options.username!r} failed (is the benchmark superuser provisioned?)')
+
+
+def fetch_login_form(client, options):
+    client.csrf_token = client.login_form()
+
+
+def post_login(client, options):
+    return client.submit_login(client.csrf_token, options.username, options.password)
+
+
+def etag_setup(client, options):
+    client.request('GET', '/admin/', headers={'Accept': 'application/json'})
+    client.etag = client.headers.get('etag')
+
+
+def revalidate(client, options):
+    return client.request('GET', '/admin/', headers={'Accept': 'application/json', 'If-None-Match': client.etag})[0]
+
+
+SCENARIOS = {
+    'health_live': Scenario(
+        'Liveness probe, answered by HealthCheckMiddleware',
+        get('/admin/health/live/'), concurrency=32,
+    ),
+    'health_ready': Scenario(
+        'ALB readiness probe (cached background checks)',
+        get('/admin/health/'), concurrency=32,
+    ),
+    'api_root': Scenario(
+        'api_root JSON, cache_page + conditional GET',
+        get('/admin/', {'Accept': 'application/json'}), concurrency=32,
+    ),
+    'api_root_304': Scenario(
+        'api_root revalidation with a matching ETag',
+        revalidate, concurrency=32, expect=(304,), setup=etag_setup,
+    ),
+    'static': Scenario(
+        'Admin CSS from WhiteNoise, precompressed',
+        get('/admin/static/admin/css/base.css'), concurrency=32,
+    ),
+    'admin_login': Scenario(
+        'Admin login form POST (password hashing bound)',
+        post_login, concurrency=4, expect=(302,), prepare=fetch_login_form,
+    ),
+    'changelist': Scenario(
+        'User changelist, first page, on the seeded table',
+        get(CHANGELIST_PATH), concurrency=8, setup=login_setup,
+    ),
+    'changelist_deep': Scenario(
+        'User changelist, page 5000 (OFFSET scan)',
+        get(f'{CHANGELIST_PATH}?p=5000'), concurrency=8, setup=login_setup,
+    ),
+}
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_scenario(scenario, options):
+    concurrency = options.concurrency or scenario.concurrency
+    clients = [Client(options.url, options.timeout) for _ in range(concurrency)]
+    if scenario.setup:
+        for client in clients:
+            scenario.setup(client, options)
+
+    started = time.perf_counter()
+    measure_from = started + options.warmup
+    deadline = measure_from + options.duration
+    latencies = [[] for _ in clients]
+    errors = [Counter() for _ in clients]
+
+    def worker(index, client):
+        samples, failures = latencies[index], errors[index]
+        while time.perf_counter() < deadline:
+            if scenario.prepare:
+                try:
+                    scenario.prepare(client, options)
+                except Exception as e:
+                    if time.perf_counter() >= measure_from:
+                        failures[type(e).__name__] += 1
+                    client.close()
+                    continue
+            begin = time.perf_counter()
+            try:
+                status = scenario.request(client, options)
+            except Exception as e:
+                status = type(e).__name__
+                client.close()
+            end = time.perf_counter()
+            if begin < measure_from:
+                continue
+            if status in scenario.expect:
+                samples.append((end - begin) * 1000)
+            else:
+                failures[str(status)] += 1
+
+    threads = [threading.Thread(target=worker, args=(index, client)) for index, client in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for client in clients:
+        client.close()
+
+    ordered = sorted(sample for samples in latencies for sample in samples)
+    failures = sum(errors, Counter())
+    return {
+        'description': scenario.description,
+        'concurrency': concurrency,
+        'duration_s': options.duration,
+        'requests': len(ordered),
+        'errors': dict(failures),
+        'rps': round(len(ordered) / options.duration, 1),
+        'latency_ms': {
+            **{f'p{pct}': round(percentile(ordered, pct), 2) if ordered else None for pct in PERCENTILES},
+            'mean': round(sum(ordered) / len(ordered), 2) if ordered else None,
+            'max': round(ordered[-1], 2) if ordered else None,
+        },
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def command_run(options):
+    names = options.scenario or list(SCENARIOS)
+    unknown = set(names) - SCENARIOS.keys()
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    report = {
+        'server_mode': options.server_mode,
+        'url': options.url,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'client': {'python': platform.python_version(), 'machine': platform.machine()},
+        'scenarios': {},
+    }
+    print(f"{'scenario':<16} {'conc':>4} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name in names:
+        result = run_scenario(SCENARIOS[name], options)
+        report['scenarios'][name] = result
+        latency = result['latency_ms']
+        print(
+            f"{name:<16} {result['concurrency']:>4} {result['rps']:>9.1f} "
+            + ' '.join(f"{latency[f'p{pct}'] or 0:>9.2f}" for pct in PERCENTILES)
+            + f" {sum(result['errors'].values()):>7}",
+            flush=True,
+        )
+
+    if options.output:
+        path = Path(options.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + '\n')
+        print(f'Results written to {path}')
+
+
+def command_compare(options):
+    """Exit 1 when a scenario got slower or lower-throughput beyond the tolerance"""
+    baseline = json.loads(Path(options.baseline).read_text())
+    current = json.loads(Path(options.current).read_text())
+    regressions = []
+    print(f"{'scenario':<16} {'metric':<6} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, before in baseline['scenarios'].items():
+        after = current['scenarios'].get(name)
+        if after is None:
+            continue
+        metrics = [(f'p{pct}', before['latency_ms'][f'p{pct}'], after['latency_ms'][f'p{pct}'], 1) for pct in PERCENTILES]
+        metrics.append(('rps', before['rps'], after['rps'], -1))
+        for metric, old, new, worse_direction in metrics:
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change * worse_direction > options.tolerance
+            if regressed:
+                regressions.append(f'{name} {metric}')
+            print(f"{name:<16} {metric:<6} {old:>10.2f} {new:>10.2f} {change:>+7.1%}{'  ❌' if regressed else ''}")
+        if sum(after['errors'].values()) > sum(before['errors'].values()):
+            regressions.append(f'{name} errors')
+            print(f"{name:<16} errors {sum(before['errors'].values()):>10} {sum(after['errors'].values()):>10}  ❌")
+
+    if regressions:
+        print(f"❌ Regressions beyond {options.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f'✅ No regressions beyond {options.tolerance:.0%}')
+
+
+def command_wait(options):
+    """Wait until the readiness probe answers 200"""
+    deadline = time.monotonic() + options.timeout
+    client = Client(options.url, timeout=5)
+    while True:
+        try:
+            if client.request('GET', '/admin/health/')[0] == 200:
+                print(f'✅ {options.url} is ready')
+                return
+        except OSError:
+            client.close()
+        if time.monotonic() > deadline:
+            sys.exit(f'❌ {options.url} not ready after {options.timeout:.0f}s')
+        time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run scenarios and report throughput and latency percentiles')
+    run.add_argument('--url', default='http://localhost:8080')
+    run.add_argument('--server-mode', default='gthread', help='Recorded in the report (default: gthread)')
+    run.add_argument(
+        '--scenario', action='append',
+        help=f"Scenario to run (repeatable; default: all of {', '.join(SCENARIOS)})",
+    )
+    run.add_argument('--duration', type=float, default=20, help='Measured seconds per scenario (default: 20)')
+    run.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds first (default: 3)')
+    run.add_argument('--concurrency', type=int, help="Connections per scenario (default: the scenario's own)")
+    run.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds (default: 30)')
+    run.add_argument('--username', default='bench')
+    run.add_argument('--password', default='bench-password')
+    run.add_argument('--output', help='Write the report as JSON to this path')
+    run.set_defaults(handler=command_run)
+
+    compare = commands.add_parser('compare', help='Compare a report against a baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument(
+        '--tolerance', type=float, default=0.15,
+        help='Allowed relative change before a metric counts as a regression (default: 0.15)',
+    )
+    compare.set_defaults(handler=command_compare)
+
+    wait = commands.add_parser('wait', help='Wait for the service to become ready')
+    wait.add_argument('--url', default='http://localhost:8080')
+    wait.add_argument('--timeout', type=float, default=180)
+    wait.set_defaults(handler=command_wait)
+
+    options = parser.parse_args()
+    options.handler(options)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/bin/bash
+# Benchmark the image against the local compose stack (Postgres 15 + app),
+# once per server mode, and compare with the committed baselines.
+#
+#   benchmarks/run.sh                    # gthread and uvicorn
+#   benchmarks/run.sh uvicorn            # one mode
+#   BENCH_SAVE_BASELINE=true benchmarks/run.sh   # record new baselines
+#
+# Environment: BENCH_ROWS (seeded auth_user rows, default 1000000),
+# BENCH_DURATION / BENCH_WARMUP (seconds per scenario), BENCH_TOLERANCE
+# (relative change counted as a regression, default 0.15), BENCH_URL.
+# Everything runs locally; nothing is downloaded besides the compose images.
+
+set -e
+
+cd "$(dirname "$0")/.."
+
+MODES="${*:-gthread uvicorn}"
+ROWS="${BENCH_ROWS:-1000000}"
+URL="${BENCH_URL:-http://localhost:8080}"
+RESULTS_DIR="benchmarks/results/$(date -u +%Y%m%dT%H%M%SZ)"
+COMPOSE="docker compose -p django-bench -f docker-compose.yml -f benchmarks/docker-compose.bench.yml"
+FAILED=false
+
+mkdir -p "$RESULTS_DIR"
+
+for MODE in $MODES; do
+    echo ""
+    echo "🏁 Server mode: $MODE"
+    echo "-------------------"
+    SERVER_MODE="$MODE" $COMPOSE up -d --build --force-recreate web
+    python3 benchmarks/loadgen.py wait --url "$URL"
+
+    # Migrations ran at boot; seeding is skipped once the rows exist
+    $COMPOSE exec -T db psql -q -U django -d django_db -v rows="$ROWS" < benchmarks/seed.sql
+
+    python3 benchmarks/loadgen.py run --url "$URL" --server-mode "$MODE" \
+        --duration "${BENCH_DURATION:-20}" --warmup "${BENCH_WARMUP:-3}" \
+        --output "$RESULTS_DIR/$MODE.json"
+
+    BASELINE="benchmarks/baselines/$MODE.json"
+    if [ "${BENCH_SAVE_BASELINE:-false}" = "true" ]; then
+        cp "$RESULTS_DIR/$MODE.json" "$BASELINE"
+        echo "📌 Saved $BASELINE"
+    elif [ -f "$BASELINE" ]; then
+        if ! python3 benchmarks/loadgen.py compare "$BASELINE" "$RESULTS_DIR/$MODE.json" \
+            --tolerance "${BENCH_TOLERANCE:-0.15}"; then
+            FAILED=true
+        fi
+    else
+        echo "ℹ️  No baseline for $MODE yet (BENCH_SAVE_BASELINE=true records one)"
+    fi
+done
+
+$COMPOSE stop
+
+echo ""
+echo "📊 Results in $RESULTS_DIR"
+if [ "$FAILED" = true ]; then
+    echo "❌ Performance regressions against the baselines"
+    exit 1
+fi
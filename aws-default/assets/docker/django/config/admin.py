@@ -0,0 +1,28 @@
+"""
+Admin registrations for the project's own ModelAdmins.
+"""
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+
+from config.auth import invalidate_users
+from config.bulk import bulk_action
+from config.changelist import LargeTableAdminMixin
+
+User = get_user_model()
+
+
+# auth_user is the table that grows into the millions
+class UserAdmin(LargeTableAdminMixin, DjangoUserAdmin):
+    actions = ['deactivate_selected']
+
+    @bulk_action(permissions=['change'], description='Deactivate selected users')
+    def deactivate_selected(self, queryset):
+        # update() sends no signals: drop the users' cached auth entries
+        invalidate_users(queryset.values_list('pk', flat=True))
+        return queryset.filter(is_active=True).update(is_active=False)
+
+
+if admin.site.is_registered(User):
+    admin.site.unregister(User)
+admin.site.register(User, UserAdmin)
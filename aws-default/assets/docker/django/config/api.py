@@ -0,0 +1,57 @@
+"""
+Django REST framework defaults.
+
+REST_FRAMEWORK (see config.settings) uses these by default:
+
+- KeysetPagination: cursor pagination on the primary key. Every page is one
+  indexed range scan however deep the client goes, and page_size is capped,
+  so a list view never loads a whole table.
+- ORJSONRenderer: orjson when installed, DRF's JSONRenderer otherwise.
+- Shared*RateThrottle: throttle history in the 'shared' cache, so limits hold
+  across all workers and tasks instead of per process.
+
+This module is imported by DRF while it loads its settings, so it must not
+import rest_framework.views (or anything that does); views live elsewhere
+(see config.exports).
+"""
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import throttling
+from rest_framework.pagination import CursorPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination on -pk with a client-selectable, bounded page size"""
+
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson; falls back to DRF's encoder for indented output or without orjson"""
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # DRF's encoder handles Decimal, lazy strings, querysets, etc.
+        return orjson.dumps(data, default=self._encoder.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class SharedAnonRateThrottle(throttling.AnonRateThrottle):
+    cache = caches['shared']
+
+
+class SharedUserRateThrottle(throttling.UserRateThrottle):
+    cache = caches['shared']
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class ConfigConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'config'
+
+    def ready(self):
+        from django.conf import settings
+
+        from config.search import enable_trigram_search, register_lookups
+        register_lookups()
+        # The admin app (listed first) has registered every ModelAdmin by now
+        enable_trigram_search()
+
+        if settings.AUTH_CACHE:
+            from config.auth import connect_signals
+            connect_signals()
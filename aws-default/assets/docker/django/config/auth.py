@@ -0,0 +1,184 @@
+"""
+Cached user and permission lookups (AUTH_CACHE).
+
+Every authenticated request loads auth_user by primary key, and admin pages
+query user_permissions and groups again for has_perm()/has_module_perms().
+With AUTH_CACHE enabled:
+
+- CachedModelBackend.get_user() keeps one entry per user in the 'shared'
+  cache: the row's concrete fields plus the user and group permission sets
+  (JSON-safe, for either cache serializer). Together with the version key it
+  is one get_many() round trip and no queries. The restored user has
+  ModelBackend's permission caches filled in.
+- Entries carry the global version (VERSION_KEY). Changes that can affect many
+  users, such as group permissions, group deletion or Permission rows, bump
+  it. Saves and deletes of a user, and changes to their groups or
+  permissions, delete that user's entry. Invalidation runs after the
+  transaction commits. Entries also expire after AUTH_CACHE_TIMEOUT, which
+  bounds staleness after writes that send no signals (queryset.update());
+  code doing those calls invalidate_users().
+- CachedAuthenticationMiddleware moves sessions logged in through
+  ModelBackend to CachedModelBackend, so enabling the cache logs nobody out.
+"""
+import functools
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.functional import SimpleLazyObject
+
+from config.stateless import AuthenticationMiddleware
+
+CACHE_ALIAS = 'shared'
+VERSION_KEY = 'auth:version'
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+CACHED_BACKEND = 'config.auth.CachedModelBackend'
+
+
+def user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from the 'shared' cache"""
+
+    def get_user(self, user_id):
+        cache = caches[CACHE_ALIAS]
+        key = user_key(user_id)
+        found = cache.get_many([key, VERSION_KEY])
+        version, entry = found.get(VERSION_KEY), found.get(key)
+        if version is not None and entry is not None and entry['version'] == version:
+            user = self.restore(entry)
+            return user if self.user_can_authenticate(user) else None
+
+        user = super().get_user(user_id)
+        if user is None:
+            return None
+        if version is None:
+            # First use, or the key was evicted: start from a value larger
+            # than any earlier version, so older entries can't match it
+            cache.add(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+            version = cache.get(VERSION_KEY)
+        cache.set(key, self.snapshot(user, version), settings.AUTH_CACHE_TIMEOUT)
+        return user
+
+    def snapshot(self, user, version):
+        fields = user._meta.concrete_fields
+        return {
+            'version': version,
+            'row': [
+                None if field.value_from_object(user) is None else field.value_to_string(user)
+                for field in fields
+            ],
+            'user_perms': sorted(self.get_user_permissions(user)),
+            'group_perms': sorted(self.get_group_permissions(user)),
+        }
+
+    def restore(self, entry):
+        model = get_user_model()
+        fields = model._meta.concrete_fields
+        user = model.from_db(
+            router.db_for_read(model),
+            [field.attname for field in fields],
+            [None if raw is None else field.to_python(raw) for field, raw in zip(fields, entry['row'])],
+        )
+        # The attributes ModelBackend memoizes permissions in
+        user._user_perm_cache = set(entry['user_perms'])
+        user._group_perm_cache = set(entry['group_perms'])
+        if user.is_active:
+            user._perm_cache = user._user_perm_cache | user._group_perm_cache
+        return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that moves ModelBackend sessions to CachedModelBackend"""
+
+    def process_request(self, request):
+        request.user = SimpleLazyObject(lambda: self.get_user(request))
+        request.auser = functools.partial(self.auser, request)
+
+    @staticmethod
+    def get_user(request):
+        if not hasattr(request, '_cached_user'):
+            if request.session.get(BACKEND_SESSION_KEY) == MODEL_BACKEND:
+                request.session[BACKEND_SESSION_KEY] = CACHED_BACKEND
+            request._cached_user = auth.get_user(request)
+        return request._cached_user
+
+    @staticmethod
+    async def auser(request):
+        if not hasattr(request, '_acached_user'):
+            if await request.session.aget(BACKEND_SESSION_KEY) == MODEL_BACKEND:
+                await request.session.aset(BACKEND_SESSION_KEY, CACHED_BACKEND)
+            request._acached_user = await auth.aget_user(request)
+        return request._acached_user
+
+
+# Invalidation
+
+def invalidate_users(pks):
+    """Drop the cached entries of these users (after commit); for writes that send no signals"""
+    if not settings.AUTH_CACHE:
+        return
+    keys = [user_key(pk) for pk in pks]
+    if keys:
+        transaction.on_commit(
+            lambda: caches[CACHE_ALIAS].delete_many(keys),
+            using=router.db_for_write(get_user_model()),
+        )
+
+
+def invalidate_all():
+    """Make every cached entry stale (after commit) by bumping the version"""
+    if not settings.AUTH_CACHE:
+        return
+
+    def bump():
+        try:
+            caches[CACHE_ALIAS].incr(VERSION_KEY)
+        except ValueError:
+            # No version key: no entry can be valid anyway
+            pass
+    transaction.on_commit(bump, using=router.db_for_write(Permission))
+
+
+def _user_changed(sender, instance, **kwargs):
+    invalidate_users([instance.pk])
+
+
+def _memberships_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        # user.groups / user.user_permissions changed
+        invalidate_users([instance.pk])
+    elif pk_set:
+        # group.user_set / permission.user_set changed
+        invalidate_users(pk_set)
+    else:
+        # Reverse clear(): the affected users are no longer known
+        invalidate_all()
+
+
+def _permissions_changed(sender, action=None, **kwargs):
+    if action is None or action.startswith('post_'):
+        invalidate_all()
+
+
+def connect_signals():
+    user_model = get_user_model()
+    post_save.connect(_user_changed, sender=user_model, dispatch_uid='auth_cache_user_saved')
+    post_delete.connect(_user_changed, sender=user_model, dispatch_uid='auth_cache_user_deleted')
+    for field in ('groups', 'user_permissions'):
+        through = getattr(user_model, field).through
+        m2m_changed.connect(_memberships_changed, sender=through, dispatch_uid=f'auth_cache_user_{field}')
+    m2m_changed.connect(_permissions_changed, sender=Group.permissions.through, dispatch_uid='auth_cache_group_perms')
+    post_delete.connect(_permissions_changed, sender=Group, dispatch_uid='auth_cache_group_deleted')
+    post_save.connect(_permissions_changed, sender=Permission, dispatch_uid='auth_cache_perm_saved')
+    post_delete.connect(_permissions_changed, sender=Permission, dispatch_uid='auth_cache_perm_deleted')
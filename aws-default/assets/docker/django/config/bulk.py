@@ -0,0 +1,356 @@
+"""
+Admin bulk actions that work through a selection in bounded chunks.
+
+The stock delete_selected loads every selected object, twice: once to list
+them all on the confirmation page and once to run the cascade collector over
+the whole selection. "Select all" on a large table runs out of memory or past
+the gunicorn timeout. Here:
+
+- The selection is read from the writer as primary keys,
+  ADMIN_BULK_CHUNK_SIZE at a time, with a keyset on pk. Each chunk is applied
+  to filter(pk__in=chunk) in its own transaction, so memory is bounded by one
+  chunk whatever the selection size.
+- @bulk_action methods do set-based work on each chunk, e.g. one UPDATE per
+  chunk with queryset.update(). Deletes use QuerySet.delete(). Its collector
+  issues one DELETE per chunk (and per cascaded table) when no signals or
+  on_delete handlers need the rows in Python, and loads only that chunk
+  otherwise.
+- Selections over ADMIN_BULK_BACKGROUND_THRESHOLD rows run as a Celery job
+  (config.tasks.run_bulk_job). A redelivered job resumes after its last
+  chunk. Progress is kept in the 'shared' cache and served as JSON at
+  <changelist>/bulk-jobs/<id>/.
+- Without REDIS_URL, tasks run eagerly and 'shared' is per-process, so there
+  are no background jobs: the request applies the selection itself and stops
+  after ADMIN_BULK_INLINE_TIME_LIMIT seconds, before the worker timeout.
+
+BulkActionsAdminMixin (part of LargeTableAdminMixin) replaces delete_selected
+with bulk_delete_selected. Its confirmation page shows the row count and the
+cascaded models instead of every object.
+"""
+import base64
+import functools
+import logging
+import pickle
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+from django.contrib.admin.utils import model_format_dict, model_ngettext
+from django.contrib.contenttypes.models import ContentType
+from django.core import signing
+from django.core.cache import caches
+from django.db import models, router, transaction
+from django.db.models.deletion import ProtectedError, RestrictedError
+from django.http import Http404, JsonResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.translation import gettext_lazy
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY = 'bulk-job:{}'
+JOB_TIMEOUT = 24 * 60 * 60
+# The pickled query travels through the broker: only run queries we signed
+_signer = signing.Signer(salt='config.bulk')
+
+
+def pk_chunks(queryset, size, after=None):
+    """Lists of at most ``size`` primary keys of queryset, in pk order, after ``after``"""
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    while True:
+        chunk = list((pks if after is None else pks.filter(pk__gt=after))[:size])
+        if not chunk:
+            return
+        yield chunk
+        after = chunk[-1]
+
+
+def apply_in_chunks(model_admin, queryset, func, after=None, progress=None, deadline=None):
+    """
+    Call ``func(model_admin, rows)`` per chunk of the selection, rows being the
+    chunk as filter(pk__in=...), in a transaction per chunk.
+
+    Returns (rows changed, last pk done, finished); finished is False when
+    ``deadline`` (time.monotonic()) passed before the selection was done.
+    """
+    using = router.db_for_write(queryset.model)
+    # Keys come from the writer: a lagging replica would hand back rows that
+    # are already gone, or miss ones just created
+    queryset = queryset.using(using)
+    manager = queryset.model._base_manager.db_manager(using)
+    done = 0
+    for chunk in pk_chunks(queryset, settings.ADMIN_BULK_CHUNK_SIZE, after):
+        with transaction.atomic(using=using):
+            done += func(model_admin, manager.filter(pk__in=chunk)) or 0
+        after = chunk[-1]
+        if progress is not None:
+            progress(done, after)
+        if deadline is not None and time.monotonic() > deadline:
+            return done, after, False
+    return done, after, True
+
+
+def delete_chunk(model_admin, queryset):
+    # QuerySet.delete() rather than ModelAdmin.delete_queryset(): there is no
+    # request in a worker
+    _, per_model = queryset.delete()
+    return per_model.get(queryset.model._meta.label, 0)
+
+
+def bulk_action(function=None, *, permissions=None, description=None):
+    """
+    @admin.action for a ModelAdmin method applied to the selection one chunk
+    at a time (in a Celery job for large selections):
+
+        @bulk_action(permissions=['change'], description='Deactivate selected users')
+        def deactivate_selected(self, queryset):
+            return queryset.update(is_active=False)
+
+    The method gets one chunk as a queryset, and no request since it may run
+    in a worker. It returns the number of rows it changed.
+    """
+    def decorator(func):
+        def action(model_admin, request, queryset):
+            return model_admin.run_bulk_action(request, queryset, func.__name__)
+        functools.update_wrapper(action, func)
+        action.bulk_chunk = func
+        return admin.action(permissions=permissions, description=description)(action)
+    return decorator if function is None else decorator(function)
+
+
+def cascade_models(model):
+    """Models whose rows a delete of ``model`` rows also deletes (on_delete=CASCADE)"""
+    found, pending = [], [model]
+    while pending:
+        for field in pending.pop()._meta.get_fields(include_hidden=True):
+            if not (field.auto_created and not field.concrete and (field.one_to_many or field.one_to_one)):
+                continue
+            related = field.related_model
+            if field.on_delete is models.CASCADE and related is not model and related not in found:
+                found.append(related)
+                pending.append(related)
+    return found
+
+
+def log_bulk_action(user_id, model, count, description, flag):
+    """One admin LogEntry summarising the action, rather than one per row"""
+    if not count or user_id is None:
+        return
+    LogEntry.objects.create(
+        user_id=user_id,
+        content_type=ContentType.objects.get_for_model(model, for_concrete_model=False),
+        object_repr=f'{count} {model_ngettext(model._meta, count)}'[:200],
+        action_flag=flag,
+        change_message=description,
+    )
+
+
+# Background jobs (config.tasks.run_bulk_job)
+
+def background_threshold():
+    """ADMIN_BULK_BACKGROUND_THRESHOLD, or 0 (never) without a broker and shared cache"""
+    if not settings.REDIS_URL or settings.CELERY_TASK_ALWAYS_EAGER:
+        # An eager job would run, and re-enqueue itself, on the request thread
+        return 0
+    return settings.ADMIN_BULK_BACKGROUND_THRESHOLD
+
+
+def load_job(job_id):
+    return caches['shared'].get(JOB_KEY.format(job_id))
+
+
+def save_job(job):
+    job['updated'] = timezone.now().isoformat()
+    caches['shared'].set(JOB_KEY.format(job['id']), job, JOB_TIMEOUT)
+
+
+def start_job(model_admin, request, queryset, name, description):
+    job = {
+        'id': uuid.uuid4().hex,
+        'model': model_admin.opts.label_lower,
+        'action': name,
+        'description': description,
+        'user': request.user.pk,
+        'state': 'queued',
+        'done': 0,
+        'total': None,
+        'after': None,
+        'error': None,
+        'created': timezone.now().isoformat(),
+    }
+    save_job(job)
+    query = _signer.sign(base64.b64encode(pickle.dumps(queryset.query)).decode())
+    # Imports Celery, which web processes otherwise never load
+    from config.tasks import run_bulk_job
+    transaction.on_commit(lambda: run_bulk_job.delay(job['id'], query))
+    return job
+
+
+def run_job(job_id, signed_query):
+    """Work on a job until it is done or out of time; returns True when it needs no more runs"""
+    job = load_job(job_id)
+    if job is None or job['state'] in ('done', 'failed'):
+        # Expired from the cache, or a duplicate delivery
+        return True
+    model = apps.get_model(job['model'])
+    model_admin = admin.site._registry[model]
+    action = getattr(type(model_admin), job['action'])
+    queryset = model._base_manager.all()
+    queryset.query = pickle.loads(base64.b64decode(_signer.unsign(signed_query)))
+
+    if job['total'] is None:
+        job['total'] = queryset.using(router.db_for_write(model)).count()
+    job['state'] = 'running'
+    save_job(job)
+
+    done_before = job['done']
+
+    def progress(done, after):
+        job.update(done=done_before + done, after=after)
+        save_job(job)
+
+    # Stop well inside the task's soft time limit; the rest is a new task
+    deadline = time.monotonic() + settings.CELERY_TASK_SOFT_TIME_LIMIT / 2
+    try:
+        _, _, finished = apply_in_chunks(
+            model_admin, queryset, action.bulk_chunk,
+            after=job['after'], progress=progress, deadline=deadline,
+        )
+    except Exception as exc:
+        logger.exception('Bulk job %s (%s on %s) failed', job_id, job['action'], job['model'])
+        job.update(state='failed', error=str(exc))
+        save_job(job)
+        log_bulk_action(job['user'], model, job['done'], job['description'], getattr(action, 'log_flag', CHANGE))
+        return True
+    if finished:
+        job['state'] = 'done'
+        save_job(job)
+        log_bulk_action(job['user'], model, job['done'], job['description'], getattr(action, 'log_flag', CHANGE))
+    return finished
+
+
+class BulkActionsAdminMixin:
+    """Chunked delete_selected and @bulk_action support for a ModelAdmin"""
+
+    bulk_delete_confirmation_template = 'admin/bulk/delete_selected_confirmation.html'
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if 'delete_selected' not in actions:
+            return actions
+        # Same place in the dropdown, same (delete) permission
+        return {
+            name: action for name, action in (
+                ('bulk_delete_selected', self.get_action('bulk_delete_selected'))
+                if name == 'delete_selected' else (name, action)
+                for name, action in actions.items()
+            )
+        }
+
+    def get_urls(self):
+        opts = self.opts
+        return [
+            path(
+                'bulk-jobs/<str:job_id>/',
+                self.admin_site.admin_view(self.bulk_job_view),
+                name=f'{opts.app_label}_{opts.model_name}_bulk_job',
+            ),
+        ] + super().get_urls()
+
+    def bulk_job_view(self, request, job_id):
+        """Progress of a background bulk job, as JSON"""
+        job = load_job(job_id)
+        if job is None or job['model'] != self.opts.label_lower or not self.has_view_or_change_permission(request):
+            raise Http404('No such bulk job')
+        return JsonResponse(job)
+
+    def bulk_action_description(self, name):
+        action = getattr(type(self), name)
+        description = getattr(action, 'short_description', name.replace('_', ' '))
+        return str(description) % model_format_dict(self.opts)
+
+    def selection_size(self, queryset):
+        """Rows selected, counting no further than the background threshold (None past it)"""
+        threshold = background_threshold()
+        if not threshold:
+            return queryset.count()
+        count = queryset.order_by().values('pk')[:threshold + 1].count()
+        return None if count > threshold else count
+
+    def run_bulk_action(self, request, queryset, name):
+        action = getattr(type(self), name)
+        description = self.bulk_action_description(name)
+
+        if self.selection_size(queryset) is None:
+            job = start_job(self, request, queryset, name, description)
+            url = reverse(
+                f'{self.admin_site.name}:{self.opts.app_label}_{self.opts.model_name}_bulk_job',
+                args=[job['id']],
+            )
+            self.message_user(request, format_html(
+                '{}: more than {} {} selected, running in the background (<a href="{}">progress</a>).',
+                description, background_threshold(), self.opts.verbose_name_plural, url,
+            ), messages.INFO)
+            return None
+
+        deadline = time.monotonic() + settings.ADMIN_BULK_INLINE_TIME_LIMIT
+        try:
+            done, _, finished = apply_in_chunks(self, queryset, action.bulk_chunk, deadline=deadline)
+        except (ProtectedError, RestrictedError) as exc:
+            # Earlier chunks are committed; the rest of the selection is untouched
+            self.message_user(request, f'{description} stopped: {exc.args[0]}', messages.ERROR)
+            return None
+        log_bulk_action(request.user.pk, self.model, done, description, getattr(action, 'log_flag', CHANGE))
+        if not finished:
+            self.message_user(request, (
+                f'{description}: stopped after {done} {model_ngettext(self.opts, done)} to stay within '
+                f'the request time limit. The rest of the selection is unchanged; run the action again.'
+            ), messages.WARNING)
+            return None
+        self.message_user(
+            request, f'{description}: {done} {model_ngettext(self.opts, done)}.', messages.SUCCESS,
+        )
+        return None
+
+    def cascade_perms_lacking(self, request):
+        """Cascaded models registered here that the user may not delete from"""
+        lacking = []
+        for model in cascade_models(self.model):
+            model_admin = self.admin_site._registry.get(model)
+            if model_admin is not None and not model_admin.has_delete_permission(request):
+                lacking.append(model._meta.verbose_name_plural)
+        return lacking
+
+    @admin.action(permissions=['delete'], description=gettext_lazy('Delete selected %(verbose_name_plural)s'))
+    def bulk_delete_selected(self, request, queryset):
+        perms_lacking = self.cascade_perms_lacking(request)
+        if request.POST.get('post') and not perms_lacking:
+            return self.run_bulk_action(request, queryset, 'bulk_delete_selected')
+
+        request.current_app = self.admin_site.name
+        context = {
+            **self.admin_site.each_context(request),
+            'title': gettext_lazy('Delete multiple objects'),
+            'subtitle': None,
+            'opts': self.opts,
+            'objects_name': str(model_ngettext(self.opts)),
+            'count': self.selection_size(queryset),
+            'threshold': background_threshold(),
+            'cascades': [model._meta.verbose_name_plural for model in cascade_models(self.model)],
+            'perms_lacking': perms_lacking,
+            # Re-posted as is: the selection stays a filter, never a list of every pk
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'media': self.media,
+        }
+        return TemplateResponse(request, self.bulk_delete_confirmation_template, context)
+
+    bulk_delete_selected.bulk_chunk = delete_chunk
+    bulk_delete_selected.log_flag = DELETION
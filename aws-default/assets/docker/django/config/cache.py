@@ -0,0 +1,235 @@
+"""
+Cache backends, serializers and view helpers.
+
+CACHES (see config.settings) defines three aliases:
+
+- 'shared': Redis when REDIS_URL is set, shared by every worker and task.
+- 'local': a small per-process LocMem tier with a short TTL and LRU eviction.
+- 'default': TieredCache, reading 'local' first and falling back to 'shared'.
+  Without Redis it is a bounded LocMem cache.
+
+Writes through the tiered cache go to both tiers. Other workers' local tiers
+can serve a stale value for at most CACHE_LOCAL_TIMEOUT seconds, so data that
+must be invalidated immediately (sessions, auth, rate limits) uses 'shared'.
+"""
+import functools
+import hashlib
+import pickle
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.redis import RedisSerializer
+from django.views.decorators.cache import cache_page
+
+from config.metrics import record_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+class TieredCache(BaseCache):
+    """Two-level cache: bounded in-process tier in front of a shared backend"""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.local_alias = options.get('LOCAL', 'local')
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            return self.local_timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        sentinel = object()
+        value = self.local.get(key, sentinel, version=version)
+        if value is sentinel:
+            value = self.shared.get(key, sentinel, version=version)
+            if value is sentinel:
+                self.misses += 1
+                record_cache(False)
+                return default
+            self.local.set(key, value, self.local_timeout, version=version)
+        self.hits += 1
+        record_cache(True)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.local.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_shared = self.shared.get_many(missing, version=version)
+            if from_shared:
+                self.local.set_many(from_shared, self.local_timeout, version=version)
+            found.update(from_shared)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        for key in keys:
+            record_cache(key in found)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(key, value, self._local_timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self.local.set_many(data, self._local_timeout(timeout), version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout), version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self.local.delete_many(keys, version=version)
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version=version) or self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class CompressedPickleSerializer(RedisSerializer):
+    """Pickle serializer that zlib-compresses payloads above CACHE_COMPRESS_MIN_BYTES"""
+
+    RAW = b'p'
+    COMPRESSED = b'z'
+
+    def __init__(self, protocol=None):
+        super().__init__(protocol)
+        self.min_bytes = getattr(settings, 'CACHE_COMPRESS_MIN_BYTES', 1024)
+
+    def encode(self, obj):
+        return pickle.dumps(obj, self.protocol)
+
+    def decode(self, data):
+        return pickle.loads(data)
+
+    def dumps(self, obj):
+        # Plain ints stay raw so Redis INCR/DECR keep working
+        if type(obj) is int:
+            return obj
+        payload = self.encode(obj)
+        if self.min_bytes and len(payload) >= self.min_bytes:
+            return self.COMPRESSED + zlib.compress(payload)
+        return self.RAW + payload
+
+    def loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            pass
+        if data[:1] == self.COMPRESSED:
+            return self.decode(zlib.decompress(data[1:]))
+        return self.decode(data[1:])
+
+
+class CompressedJSONSerializer(CompressedPickleSerializer):
+    """JSON variant: smaller and language-neutral, but only for JSON-safe values"""
+
+    def encode(self, obj):
+        if orjson is not None:
+            return orjson.dumps(obj)
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def decode(self, data):
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+def cache_stats():
+    """Hit/miss counters of the default cache when it is tiered"""
+    default = caches['default']
+    if isinstance(default, TieredCache):
+        return {'hits': default.hits, 'misses': default.misses}
+    return None
+
+
+def cached(timeout=DEFAULT_TIMEOUT, key_prefix=None, alias='default'):
+    """
+    Memoize a function's return value in the cache.
+
+    The key is derived from the function name and its arguments, which must
+    have a stable repr(). Use for expensive, read-mostly lookups.
+    """
+    def decorator(func):
+        prefix = key_prefix or f'{func.__module__}.{func.__qualname__}'
+
+        def make_key(args, kwargs):
+            digest = hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+            return f'fn:{prefix}:{digest}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            cache = caches[alias]
+            sentinel = object()
+            value = cache.get(key, sentinel)
+            if value is sentinel:
+                value = func(*args, **kwargs)
+                cache.set(key, value, timeout)
+            return value
+
+        wrapper.invalidate = lambda *args, **kwargs: caches[alias].delete(make_key(args, kwargs))
+        return wrapper
+    return decorator
+
+
+class CachedViewMixin:
+    """
+    Per-view response caching for DRF/class-based views.
+
+    Set ``cache_timeout`` (seconds) on the view; responses to GET/HEAD are
+    cached in ``cache_alias`` keyed by URL and the headers listed in Vary.
+    """
+
+    cache_timeout = None
+    cache_alias = 'default'
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        timeout = cls.cache_timeout
+        if timeout is None:
+            timeout = settings.CACHE_VIEW_TIMEOUT
+        return cache_page(timeout, cache=cls.cache_alias)(view)
@@ -0,0 +1,47 @@
+"""
+Celery application, run from the same image as the web service:
+
+    entrypoint.sh worker    ->  celery -A config.celery worker
+    entrypoint.sh beat      ->  celery -A config.celery beat
+
+Settings come from CELERY_* in config.settings (Redis broker, acks late,
+results ignored). Worker concurrency and prefetch are sized from the
+container's cgroup CPU/memory limits unless set explicitly.
+
+This module is deliberately not imported from config/__init__.py, so web
+processes don't pay for Celery at boot: code that enqueues tasks imports
+config.tasks, which imports the app.
+"""
+import math
+import os
+
+from celery import Celery
+
+from config.cgroup import cpu_limit, env_int, memory_limit_mb
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+def default_concurrency():
+    """Prefork processes: two per CPU (tasks mostly wait on I/O), capped by memory"""
+    concurrency = max(2, math.ceil(cpu_limit()) * 2)
+    memory_mb = memory_limit_mb()
+    if memory_mb:
+        per_process_mb = env_int('CELERY_WORKER_MEMORY_MB', 256)
+        concurrency = max(1, min(concurrency, int(memory_mb * 0.8) // per_process_mb))
+    return concurrency
+
+
+def default_prefetch_multiplier():
+    # With a fraction of a CPU a prefetched message can wait behind one slow
+    # task for its whole duration; with whole CPUs a small prefetch hides the
+    # broker round trip for short tasks.
+    return 1 if cpu_limit() < 1 else 4
+
+
+app.conf.worker_concurrency = env_int('CELERY_WORKER_CONCURRENCY', default_concurrency())
+app.conf.worker_prefetch_multiplier = env_int('CELERY_WORKER_PREFETCH_MULTIPLIER', default_prefetch_multiplier())
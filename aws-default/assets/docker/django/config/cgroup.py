@@ -0,0 +1,59 @@
+"""
+Container resource limits read from cgroups (v2, with v1 fallback).
+
+Used to size gunicorn and Celery to the ECS task instead of the host, since
+os.cpu_count() reports the underlying instance's CPUs. Deliberately free of
+Django imports so gunicorn.conf.py can use it before the app loads.
+"""
+import math
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+# cgroup v1 reports "unlimited" memory as a huge page-aligned number
+UNLIMITED_MEMORY = 1 << 60
+
+
+def _read(path):
+    try:
+        with open(path) as handle:
+            return handle.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_limit():
+    """Number of CPUs the container may use (fractional), or the host count"""
+    quota = period = None
+    cpu_max = _read(os.path.join(CGROUP_ROOT, 'cpu.max'))
+    if cpu_max:
+        raw_quota, _, raw_period = cpu_max.partition(' ')
+        if raw_quota != 'max':
+            quota, period = int(raw_quota), int(raw_period or 100000)
+    else:
+        raw_quota = _read(os.path.join(CGROUP_ROOT, 'cpu', 'cpu.cfs_quota_us'))
+        raw_period = _read(os.path.join(CGROUP_ROOT, 'cpu', 'cpu.cfs_period_us'))
+        if raw_quota and raw_period and int(raw_quota) > 0:
+            quota, period = int(raw_quota), int(raw_period)
+
+    host_cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    if quota and period:
+        return min(quota / period, host_cpus or math.inf)
+    return float(host_cpus or 1)
+
+
+def memory_limit_mb():
+    """Memory limit of the container in MB, or None when unlimited"""
+    raw = _read(os.path.join(CGROUP_ROOT, 'memory.max'))
+    if raw is None:
+        raw = _read(os.path.join(CGROUP_ROOT, 'memory', 'memory.limit_in_bytes'))
+    if not raw or raw == 'max':
+        return None
+    limit = int(raw)
+    if limit >= UNLIMITED_MEMORY:
+        return None
+    return limit // (1024 * 1024)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
@@ -0,0 +1,244 @@
+"""
+Admin changelists for tables with millions of rows.
+
+A stock changelist page runs COUNT(*) twice (filtered, and unfiltered for
+"N total"), pages with OFFSET (a scan of every skipped row) and, for foreign
+keys shown through callables or nullable FKs, one query per row.
+LargeTableAdmin (or LargeTableAdminMixin in front of another ModelAdmin)
+changes that:
+
+- EstimatedCountPaginator: on PostgreSQL the row count comes from
+  pg_class.reltuples (unfiltered) or the planner's estimate (filtered) once
+  it reaches ADMIN_COUNT_ESTIMATE_THRESHOLD; smaller results are counted
+  exactly. The unfiltered "N total" count is not run at all.
+- list_select_related is derived from list_display, including nullable FKs
+  and "fk__field" columns, unless set explicitly.
+- A "Next" link continues after the last row shown (?after=<cursor>), as a
+  keyset range scan on the changelist ordering, so deep pages cost the same
+  as the first. Page-number links stay for the first pages.
+- search_fields are served by pg_trgm indexes (config.search), and
+  delete_selected works in chunks or as a background job (config.bulk).
+"""
+import base64
+import functools
+import json
+import operator
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR, PAGE_VAR, ChangeList
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from config.bulk import BulkActionsAdminMixin
+from config.search import TrigramSearchMixin
+
+KEYSET_VAR = 'after'
+# Set by LargeTableAdminMixin.changelist_view from the stripped query string
+KEYSET_CURSOR_ATTR = 'admin_keyset_cursor'
+
+
+def estimated_count(queryset):
+    """Postgres' row estimate for a queryset, or None where there isn't one"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator:
+            # Unfiltered: the table statistics kept by (auto)ANALYZE
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        else:
+            # Filtered: the planner's estimate for the same WHERE clause,
+            # without ordering or joins that don't change the row count
+            sql, params = queryset.order_by().select_related(None).query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            row = (plan[0]['Plan']['Plan Rows'],)
+    # reltuples is -1 (PostgreSQL 14+) or 0 before the first ANALYZE
+    if not row or row[0] is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is an estimate for large results on PostgreSQL"""
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        threshold = settings.ADMIN_COUNT_ESTIMATE_THRESHOLD
+        if threshold > 0 and hasattr(self.object_list, 'query'):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                self.estimated = True
+                return estimate
+        return super().count
+
+
+def related_paths(model, list_display):
+    """The select_related() paths that list_display's columns traverse"""
+    paths = []
+    for name in list_display:
+        if not isinstance(name, str):
+            continue
+        opts, path = model._meta, []
+        for part in name.split('__'):
+            try:
+                field = opts.get_field(part)
+            except FieldDoesNotExist:
+                break
+            # <fk>_id columns and reverse relations need no join
+            if not (field.many_to_one or field.one_to_one) or not field.concrete or part == field.attname:
+                break
+            path.append(part)
+            opts = field.related_model._meta
+        if path:
+            paths.append('__'.join(path))
+    # Only the longest paths: select_related('a__b') already joins 'a'
+    return tuple(sorted(
+        path for path in set(paths)
+        if not any(other.startswith(f'{path}__') for other in paths)
+    ))
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, count):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise IncorrectLookupParameters('Invalid page cursor')
+    if not isinstance(values, list) or len(values) != count:
+        raise IncorrectLookupParameters('Invalid page cursor')
+    return values
+
+
+class LargeTableChangeList(ChangeList):
+    keyset_page = False
+
+    def get_keyset_fields(self, request):
+        """
+        (field, descending) pairs ordering the changelist uniquely, or None
+        when the ordering can't be resumed with a keyset (expressions,
+        related or nullable fields)
+        """
+        fields = []
+        for item in self.get_ordering(request, self.queryset):
+            if not isinstance(item, str) or '__' in item.lstrip('-'):
+                return None
+            name = item.lstrip('-')
+            try:
+                field = self.lookup_opts.pk if name == 'pk' else self.lookup_opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null:
+                return None
+            fields.append((field, item.startswith('-')))
+            if field.unique:
+                # Everything after a unique column only breaks ties that
+                # can't happen, and would keep an index from being used
+                return fields
+        return None
+
+    def get_results(self, request):
+        cursor = getattr(request, KEYSET_CURSOR_ATTR, None)
+        self.keyset_fields = self.get_keyset_fields(request)
+        if cursor is None or not self.keyset_fields:
+            super().get_results(request)
+            return
+
+        values = decode_cursor(cursor, len(self.keyset_fields))
+        clauses, equal = [], {}
+        try:
+            for (field, descending), raw in zip(self.keyset_fields, values):
+                value = field.to_python(raw)
+                clauses.append(Q(**equal, **{f"{field.name}__{'lt' if descending else 'gt'}": value}))
+                equal[field.name] = value
+        except ValidationError:
+            raise IncorrectLookupParameters('Invalid page cursor')
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.keyset_page = True
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = self.queryset.filter(functools.reduce(operator.or_, clauses))[:self.list_per_page]
+        self.can_show_all = False
+        self.multi_page = True
+        self.paginator = paginator
+
+    @property
+    def count_is_estimated(self):
+        return getattr(self.paginator, 'estimated', False)
+
+    @property
+    def pagination_required(self):
+        return not self.keyset_page and (not self.show_all or not self.can_show_all) and self.multi_page
+
+    @property
+    def page_range(self):
+        return self.paginator.get_elided_page_range(self.page_num) if self.pagination_required else []
+
+    @property
+    def show_all_url(self):
+        if self.can_show_all and not self.show_all and self.multi_page:
+            return self.get_query_string({ALL_VAR: ''})
+        return None
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string(remove=[PAGE_VAR])
+
+    @cached_property
+    def next_page_url(self):
+        """Keyset link to the rows after the last one shown, or None"""
+        if not self.keyset_fields or not self.multi_page or (self.show_all and self.can_show_all):
+            return None
+        rows = list(self.result_list)
+        if len(rows) < self.list_per_page:
+            return None
+        last = rows[-1]
+        cursor = encode_cursor([field.value_to_string(last) for field, _ in self.keyset_fields])
+        return self.get_query_string({KEYSET_VAR: cursor}, remove=[PAGE_VAR])
+
+
+class LargeTableAdminMixin(BulkActionsAdminMixin, TrigramSearchMixin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/large_table/change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
+
+    def get_list_select_related(self, request):
+        # An explicit list_select_related (tuple or True) wins
+        if self.list_select_related is not False:
+            return self.list_select_related
+        return related_paths(self.model, self.get_list_display(request))
+
+    def changelist_view(self, request, extra_context=None):
+        # The cursor isn't a filter: take it out of the query string so the
+        # changelist doesn't reject it and sort/filter links start over
+        if KEYSET_VAR in request.GET:
+            request.GET = request.GET.copy()
+            setattr(request, KEYSET_CURSOR_ATTR, request.GET.pop(KEYSET_VAR)[-1])
+        return super().changelist_view(request, extra_context)
+
+
+class LargeTableAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    pass
@@ -0,0 +1,226 @@
+"""
+HTTP conditional GET for read endpoints.
+
+conditional() (and ConditionalViewMixin for class-based/DRF views) computes
+an ETag and/or Last-Modified *before* the view body runs, answers 304 Not Modified
+when the client's If-None-Match / If-Modified-Since still matches, and adds
+Cache-Control and Vary so CloudFront and browsers can reuse responses.
+
+Validators have to be cheaper than the body they replace:
+
+- version_etag(*names): built from version counters kept in the 'shared'
+  cache (one get_many). track_model(Model) bumps a model's counter after
+  every committed save/delete, so any change to it changes the ETag. Only
+  with REDIS_URL: a per-process LocMem counter bumped in one worker is
+  invisible to the others, which would keep answering 304 for stale content.
+- latest_modified(queryset, field='updated_at'): one indexed MAX() query.
+- A plain string, for responses that only change with a deploy.
+"""
+import functools
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+VERSION_KEY = 'version:{}'
+
+
+def model_version_name(model):
+    return f'model:{model._meta.label_lower}'
+
+
+def bump_version(*names):
+    """Invalidate every ETag built from these version counters"""
+    cache = caches['shared']
+    for name in names:
+        key = VERSION_KEY.format(name)
+        # add() initialises the counter; incr() is atomic on Redis
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+
+def get_versions(*names):
+    found = caches['shared'].get_many([VERSION_KEY.format(name) for name in names])
+    return [found.get(VERSION_KEY.format(name), 0) for name in names]
+
+
+def _bump_model(sender, **kwargs):
+    name = model_version_name(sender)
+    transaction.on_commit(lambda: bump_version(name), using=kwargs.get('using'))
+
+
+def track_model(model):
+    """Bump the model's version counter after each committed save, delete or m2m change"""
+    uid = f'config.conditional:{model._meta.label_lower}'
+    post_save.connect(_bump_model, sender=model, dispatch_uid=uid)
+    post_delete.connect(_bump_model, sender=model, dispatch_uid=uid)
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(
+            lambda sender, **kwargs: _bump_model(model, **kwargs),
+            sender=field.remote_field.through, dispatch_uid=f'{uid}:{field.name}', weak=False,
+        )
+
+
+def version_etag(*names_or_models, vary_on_user=False):
+    """ETag function over version counters (names or tracked models); no ETag without REDIS_URL"""
+    names = []
+    for item in names_or_models:
+        if isinstance(item, str):
+            names.append(item)
+        else:
+            track_model(item)
+            names.append(model_version_name(item))
+
+    def etag(request, *args, **kwargs):
+        if not settings.REDIS_URL:
+            return None
+        parts = [request.get_full_path(), *map(str, get_versions(*names))]
+        if vary_on_user:
+            parts.append(str(request.user.pk))
+        return hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return etag
+
+
+def latest_modified(queryset, field='updated_at'):
+    """Last-Modified function returning MAX(field) of the queryset"""
+    def last_modified(request, *args, **kwargs):
+        return queryset.aggregate(latest=Max(field))['latest']
+    return last_modified
+
+
+def _resolve(etag, last_modified, request, args, kwargs):
+    if callable(etag):
+        etag = etag(request, *args, **kwargs)
+    if etag is not None:
+        etag = quote_etag(etag)
+    if callable(last_modified):
+        last_modified = last_modified(request, *args, **kwargs)
+    if last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+    return etag, last_modified
+
+
+def conditional(etag=None, last_modified=None, max_age=None, shared_max_age=None, public=True, vary=('Accept',)):
+    """
+    Decorator adding validators, 304 handling, Cache-Control and Vary to a view.
+
+    ``etag`` / ``last_modified`` are values or callables taking the view's
+    arguments. ``public=False`` marks responses private (never stored by
+    CloudFront) and varies them on Cookie and Authorization. Max ages default
+    to HTTP_CACHE_MAX_AGE / HTTP_CACHE_SHARED_MAX_AGE.
+    """
+    vary = list(vary) if public else [*vary, 'Cookie', 'Authorization']
+
+    def finish(request, response, res_etag, res_last_modified):
+        if request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304):
+            return response
+        if res_etag:
+            response.headers.setdefault('ETag', res_etag)
+        if res_last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(res_last_modified)
+        age = settings.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+        if public:
+            shared = settings.HTTP_CACHE_SHARED_MAX_AGE if shared_max_age is None else shared_max_age
+            patch_cache_control(response, public=True, max_age=age, s_maxage=shared)
+        else:
+            patch_cache_control(response, private=True, max_age=age)
+            if age == 0:
+                # Always revalidate, which is cheap now that a 304 is possible
+                patch_cache_control(response, no_cache=True)
+        # Public responses never get no-cache: it would make CloudFront
+        # revalidate every request and void s-maxage. max-age=0 is enough to
+        # make browsers revalidate.
+        patch_vary_headers(response, vary)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            # Validators may query the database, which needs a sync thread;
+            # constant validators don't
+            resolve = sync_to_async(_resolve) if callable(etag) or callable(last_modified) else None
+
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if resolve is None:
+                    res_etag, res_last_modified = _resolve(etag, last_modified, request, args, kwargs)
+                else:
+                    res_etag, res_last_modified = await resolve(etag, last_modified, request, args, kwargs)
+                response = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return finish(request, response, res_etag, res_last_modified)
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            res_etag, res_last_modified = _resolve(etag, last_modified, request, args, kwargs)
+            response = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return finish(request, response, res_etag, res_last_modified)
+        return wrapper
+    return decorator
+
+
+class ConditionalViewMixin:
+    """
+    conditional() for class-based and DRF views.
+
+    Set ``etag_versions`` (version names and/or models) and/or
+    ``last_modified_queryset`` + ``last_modified_field``; ``cache_public``
+    defaults to False because API responses usually depend on the user.
+
+    The check wraps the get() handler, not the whole view: it runs after
+    dispatch()'s and DRF's initial() checks, so clients that fail
+    authentication, permissions or throttling get their 401/403/429 rather
+    than a 304 confirming the version.
+    """
+
+    etag_versions = ()
+    etag_vary_on_user = False
+    last_modified_queryset = None
+    last_modified_field = 'updated_at'
+    cache_max_age = None
+    cache_shared_max_age = None
+    cache_public = False
+    cache_vary = ('Accept',)
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Built once per view class, not per request
+        etag = None
+        if cls.etag_versions:
+            etag = version_etag(*cls.etag_versions, vary_on_user=cls.etag_vary_on_user)
+        last_modified = None
+        if cls.last_modified_queryset is not None:
+            last_modified = latest_modified(cls.last_modified_queryset, cls.last_modified_field)
+        cls._conditional = staticmethod(conditional(
+            etag=etag,
+            last_modified=last_modified,
+            max_age=cls.cache_max_age,
+            shared_max_age=cls.cache_shared_max_age,
+            public=cls.cache_public,
+            vary=cls.cache_vary,
+        ))
+        return super().as_view(**initkwargs)
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        # Wrap this instance's handler: dispatch() still looks it up and
+        # calls it after its own checks (and DRF's initial())
+        get = getattr(self, 'get', None)
+        if get is not None:
+            wrapped = self._conditional(get)
+            if self.__dict__.get('head') == get:
+                # View.setup() made head an alias of get
+                self.head = wrapped
+            self.get = wrapped
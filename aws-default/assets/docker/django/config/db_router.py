@@ -0,0 +1,186 @@
+"""
+Read-replica routing for the Aurora reader endpoint.
+
+Reads go to the 'replica' alias and writes to 'default' (the writer), except:
+
+- once a request writes (or uses an unsafe HTTP method) it is pinned to the
+  writer for the rest of the request, and for REPLICA_PIN_SECONDS afterwards
+  via a cookie, so users always read their own writes. Pinning only exists
+  inside ReplicaPinningMiddleware: outside a request (Celery tasks, management
+  commands) nothing would ever unpin, so a write doesn't pin there;
+- reads inside a transaction on the writer stay on the writer;
+- until the replica's lag has been measured, while it is unreachable, or while
+  it lags more than REPLICA_MAX_LAG_SECONDS (measured by the health monitor,
+  see config.health), reads use the writer.
+"""
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from config.health import monitor
+
+REPLICA = 'replica'
+WRITER = 'default'
+
+# None outside ReplicaPinningMiddleware, else whether the request is pinned
+_pinned = contextvars.ContextVar('db_pinned', default=None)
+_wrote = contextvars.ContextVar('db_wrote', default=False)
+
+
+class ReplicaState:
+    """Latest replica health as seen by the health monitor thread"""
+
+    # Unknown until the first measurement: use the writer until then
+    available = False
+    lag_seconds = None
+    # None until we know whether aurora_replica_status() exists on this server
+    aurora = None
+
+
+replica_state = ReplicaState()
+
+AURORA_LAG_SQL = (
+    'SELECT replica_lag_in_msec / 1000.0 FROM aurora_replica_status() '
+    'WHERE server_id = aurora_db_instance_identifier()'
+)
+# Idle writers stop producing WAL, so replay timestamps alone overstate lag;
+# a fully replayed replica is treated as current.
+POSTGRES_LAG_SQL = (
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+
+def pin_to_writer():
+    """Route the remaining reads of the current request to the writer"""
+    if _pinned.get() is not None:
+        _pinned.set(True)
+
+
+def is_pinned():
+    return bool(_pinned.get())
+
+
+def measure_replica_lag():
+    """Measure replica lag in seconds and update replica_state; raises if unreachable"""
+    connection = connections[REPLICA]
+    try:
+        lag = None
+        with connection.cursor() as cursor:
+            if replica_state.aurora is not False:
+                try:
+                    cursor.execute(AURORA_LAG_SQL)
+                    row = cursor.fetchone()
+                    replica_state.aurora = True
+                    lag = row[0] if row else None
+                except Exception:
+                    replica_state.aurora = False
+            if not replica_state.aurora:
+                cursor.execute(POSTGRES_LAG_SQL)
+                lag = cursor.fetchone()[0]
+    except Exception:
+        replica_state.available = False
+        connection.close()
+        raise
+    finally:
+        if settings.DB_POOL:
+            connection.close()
+
+    replica_state.lag_seconds = float(lag or 0)
+    replica_state.available = replica_state.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+    if not replica_state.available:
+        raise RuntimeError(f'replica lag {replica_state.lag_seconds:.1f}s')
+    return replica_state.lag_seconds
+
+
+class ReplicaRouter:
+    """Send reads to the replica and everything else to the writer"""
+
+    def db_for_read(self, model, **hints):
+        if _pinned.get():
+            return WRITER
+        if not replica_state.available:
+            if replica_state.lag_seconds is None:
+                # Not measured yet; outside requests nothing else starts the monitor
+                monitor.ensure_started()
+            return WRITER
+        if connections[WRITER].in_atomic_block:
+            return WRITER
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        if _pinned.get() is not None:
+            _pinned.set(True)
+            _wrote.set(True)
+        return WRITER
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == WRITER
+
+
+class ReplicaPinningMiddleware:
+    """Scope writer pinning to a request and carry it over via a short-lived cookie"""
+
+    safe_methods = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = settings.REPLICA_PIN_COOKIE
+        self.pin_seconds = settings.REPLICA_PIN_SECONDS
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        tokens = self.begin(request)
+        try:
+            response = self.get_response(request)
+            self.finish(request, response)
+        finally:
+            self.end(tokens)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self.begin(request)
+        try:
+            response = await self.get_response(request)
+            self.finish(request, response)
+        finally:
+            self.end(tokens)
+        return response
+
+    def begin(self, request):
+        # Lag measurements come from the health monitor thread
+        monitor.ensure_started()
+        pinned = (
+            request.method not in self.safe_methods
+            or self.cookie_name in request.COOKIES
+        )
+        return _pinned.set(pinned), _wrote.set(False)
+
+    def finish(self, request, response):
+        if _wrote.get():
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=self.pin_seconds,
+                httponly=True,
+                secure=request.is_secure(),
+                samesite='Lax',
+            )
+
+    def end(self, tokens):
+        pinned_token, wrote_token = tokens
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
@@ -0,0 +1,90 @@
+"""
+Password hashers whose cost comes from settings.
+
+PASSWORD_HASHER picks the algorithm new hashes use (pbkdf2, argon2 or
+scrypt); its cost parameters (PASSWORD_PBKDF2_ITERATIONS, PASSWORD_ARGON2_*,
+PASSWORD_SCRYPT_*) default to Django's own. The algorithm names are Django's,
+so existing hashes keep verifying.
+
+Django rehashes a password on successful login when must_update() reports
+that the stored hash uses another algorithm or other cost parameters, so
+changing the policy (up or down) converges as users log in. Measure the cost
+on the task size with `manage.py benchmark_hashers` before changing it.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def scrypt_maxmem(n, r):
+    """
+    hashlib.scrypt's memory limit for work factor n and block size r: scrypt
+    needs 128 * n * r bytes, and hashlib refuses more than 32 MiB unless told
+    otherwise. Twice that leaves room for OpenSSL's own overhead.
+    """
+    return 256 * n * r
+
+
+def _setting(name, default):
+    value = getattr(settings, name, None)
+    return default if value is None else value
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _setting('PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return _setting('PASSWORD_ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _setting('PASSWORD_ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _setting('PASSWORD_ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return _setting('PASSWORD_SCRYPT_WORK_FACTOR', ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return _setting('PASSWORD_SCRYPT_BLOCK_SIZE', ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return _setting('PASSWORD_SCRYPT_PARALLELISM', ScryptPasswordHasher.parallelism)
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        # Django's encode() passes one maxmem for every hash. Size it from the
+        # parameters of *this* hash: when verifying they are the stored ones,
+        # which may be stronger than the current settings
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=scrypt_maxmem(n, r),
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
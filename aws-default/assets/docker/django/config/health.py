@@ -0,0 +1,180 @@
+"""
+Background dependency probes for the readiness endpoint.
+
+The probes (database, cache, disk) run in a daemon thread on a fixed interval
+and publish a pre-rendered result. Health requests only read that result, so
+ALB probes never open a database connection on the request path.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+_last_pool_check = 0.0
+
+
+def check_database():
+    """Run a trivial query on the default connection owned by the probe thread"""
+    from django.db import connections
+
+    connection = connections['default']
+    check_pool(connection)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception:
+        # Drop the broken connection so the next probe reconnects
+        connection.close()
+        raise
+    if getattr(settings, 'DB_POOL', False):
+        # Hand the connection back so the probe doesn't pin a pool slot
+        connection.close()
+
+
+def check_pool(connection):
+    """Verify idle pooled connections every DB_POOL_CHECK_INTERVAL seconds"""
+    global _last_pool_check
+
+    if not getattr(settings, 'DB_POOL', False):
+        return
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return
+    now = time.monotonic()
+    if now - _last_pool_check < settings.DB_POOL_CHECK_INTERVAL:
+        return
+    _last_pool_check = now
+    # Discards broken connections and refills to min_size in the pool's workers
+    pool.check()
+
+
+def check_replica():
+    """Measure replica lag; the router stops using the replica while this fails"""
+    from config.db_router import measure_replica_lag
+
+    measure_replica_lag()
+
+
+def check_cache():
+    """Round-trip a key through the shared cache (Redis when configured)"""
+    from django.core.cache import caches
+
+    cache = caches['shared']
+    token = str(time.monotonic())
+    cache.set('health:probe', token, 30)
+    if cache.get('health:probe') != token:
+        raise RuntimeError('cache did not return the written value')
+
+
+def check_disk():
+    """Make sure the temp directory is writable and has enough free space"""
+    min_free_mb = getattr(settings, 'HEALTH_DISK_MIN_FREE_MB', 100)
+    path = tempfile.gettempdir()
+    free_mb = shutil.disk_usage(path).free // (1024 * 1024)
+    if free_mb < min_free_mb:
+        raise RuntimeError(f'only {free_mb} MB free in {path}')
+    with tempfile.TemporaryFile(dir=path) as handle:
+        handle.write(b'ok')
+
+
+# name -> (probe callable, critical). Non-critical failures are reported but
+# don't take the task out of the target group.
+PROBES = {
+    'database': (check_database, True),
+    # Most requests only need the database, so a Redis blip shouldn't drain
+    # every task at once; it is critical only when every authenticated
+    # request reads it (sessions or the auth cache live there)
+    'cache': (
+        check_cache,
+        settings.SESSION_BACKEND in ('cache', 'cached_db') or settings.AUTH_CACHE,
+    ),
+    'disk': (check_disk, True),
+}
+
+if 'replica' in settings.DATABASES:
+    # Replica problems only move reads back to the writer (config.db_router)
+    PROBES['replica'] = (check_replica, False)
+
+
+class HealthResult:
+    """Immutable snapshot of the last probe run, with the response body pre-rendered"""
+
+    __slots__ = ('ready', 'checks', 'checked_at', 'body')
+
+    def __init__(self, ready, checks, checked_at):
+        self.ready = ready
+        self.checks = checks
+        self.checked_at = checked_at
+        self.body = json.dumps({
+            'status': 'ok' if ready else 'unavailable',
+            'checks': checks,
+        }).encode()
+
+
+class HealthMonitor:
+    """Runs PROBES periodically in a daemon thread and caches the outcome"""
+
+    def __init__(self, interval=None):
+        self.interval = interval or getattr(settings, 'HEALTH_CHECK_INTERVAL', 10)
+        self.result = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        """Start the probe thread once per process (threads don't survive a fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.result = None
+            thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+
+    def run_probes(self):
+        checks = {}
+        ready = True
+        for name, (probe, critical) in PROBES.items():
+            started = time.perf_counter()
+            try:
+                probe()
+                checks[name] = {'ok': True}
+            except Exception as e:
+                logger.warning('Health probe %s failed: %s', name, e)
+                checks[name] = {'ok': False, 'error': str(e)[:200]}
+                if critical:
+                    ready = False
+            checks[name]['ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.result = HealthResult(ready, checks, time.monotonic())
+        return self.result
+
+    def current(self):
+        """Return the cached result, or None if it is missing or stale"""
+        result = self.result
+        if result is None:
+            return None
+        if time.monotonic() - result.checked_at > self.interval * 3:
+            # The probe thread is stuck (e.g. a hanging connect); don't trust old data
+            return None
+        return result
+
+    def _run(self):
+        while True:
+            try:
+                self.run_probes()
+            except Exception:
+                logger.exception('Health monitor iteration failed')
+            time.sleep(self.interval)
+
+
+monitor = HealthMonitor()
@@ -0,0 +1,49 @@
+"""
+Postgres advisory locks for once-per-deploy work (migrations, provisioning).
+
+Every ECS task runs the same entrypoint, so work that must happen once per
+deploy is done by whichever task takes the lock first; the others wait (or
+skip) instead of racing. On non-Postgres databases (SQLite in development)
+the lock is a no-op.
+"""
+import contextlib
+import hashlib
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def lock_id(name):
+    """Stable signed 64-bit key for pg_advisory_lock derived from a name"""
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+@contextlib.contextmanager
+def advisory_lock(name, using=DEFAULT_DB_ALIAS, wait=True):
+    """
+    Hold a session-level advisory lock for the duration of the block.
+
+    Yields True when the lock is held. With wait=False, yields False
+    immediately if another session holds it.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        yield True
+        return
+
+    key = lock_id(name)
+    with connection.cursor() as cursor:
+        if wait:
+            cursor.execute('SELECT pg_advisory_lock(%s)', [key])
+            acquired = True
+        else:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+            acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            # Release explicitly: with connection pooling the session outlives
+            # this block and would keep the lock.
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
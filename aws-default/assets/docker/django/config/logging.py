@@ -0,0 +1,244 @@
+"""
+Non-blocking structured logging.
+
+Request threads only put records on a bounded in-memory queue
+(AsyncQueueHandler); a QueueListener thread per process formats them as
+single-line JSON and writes them to stdout, so a slow stdout/awslogs pipe
+never stalls a request. When the queue is full the record is dropped and
+counted instead of blocking (see dropped_records()).
+
+RequestLogMiddleware assigns each request an ID (X-Request-ID, else the ALB
+trace ID, else a new one), makes it available to every log record emitted
+while the request runs, and writes one access log line with status and
+latency. It replaces gunicorn's access log.
+"""
+import atexit
+import contextvars
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+access_logger = logging.getLogger('config.access')
+
+# LogRecord attributes that are not user-supplied "extra" fields
+_RESERVED = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request_id and any extra fields"""
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exception'] = record.exc_text
+        if orjson is not None:
+            return orjson.dumps(payload, default=str).decode()
+        return json.dumps(payload, default=str, separators=(',', ':'))
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Called at exit; wait briefly for room instead of failing on a full queue
+        try:
+            self.queue.put(self._sentinel, timeout=2)
+        except queue.Full:
+            pass
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Bounded, non-blocking QueueHandler whose listener starts lazily.
+
+    The queue and listener are recreated when the pid changes, so a handler
+    configured in the gunicorn master (preload_app) works in every worker.
+    """
+
+    def __init__(self, maxsize=10000, stream='stdout'):
+        self.maxsize = maxsize
+        self.stream = stream
+        self.dropped = 0
+        self._pid = None
+        self._listener = None
+        self._start_lock = threading.Lock()
+        super().__init__(queue.Queue(maxsize))
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Never reuse a queue inherited across fork: its lock may be held
+            # by a thread that doesn't exist in this process.
+            self.queue = queue.Queue(self.maxsize)
+            self.dropped = 0
+            target = logging.StreamHandler(getattr(sys, self.stream))
+            target.setFormatter(self.formatter or JSONFormatter())
+            self._listener = _Listener(self.queue, target, respect_handler_level=False)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Resolve everything that depends on the calling thread now; the
+        # listener formats the record later on its own thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        if getattr(record, 'request_id', None) is None:
+            record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        self.ensure_started()
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+class HealthProbeFilter(logging.Filter):
+    """
+    Drop django.request's "Service Unavailable" errors for health-check paths.
+
+    A readiness 503 is the probe doing its job (still starting, or a critical
+    dependency down, which the health monitor already logs as a warning); as an
+    ERROR on every ALB check it would flood alerting and Sentry. The access
+    log still records each one.
+    """
+
+    def __init__(self, paths=()):
+        super().__init__()
+        self.paths = frozenset(paths)
+
+    def filter(self, record):
+        request = getattr(record, 'request', None)
+        return not (
+            getattr(record, 'status_code', None) == 503
+            and request is not None
+            and request.path_info in self.paths
+        )
+
+
+def dropped_records():
+    """Records dropped by this process's AsyncQueueHandlers because their queue was full"""
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, AsyncQueueHandler)
+    )
+
+
+class RequestLogMiddleware:
+    """
+    Request ID propagation and access logging.
+
+    Runs before HealthCheckMiddleware so probes are logged too, but successful
+    probes only at ACCESS_LOG_HEALTH_SAMPLE_RATE: the ALB and container checks
+    would otherwise dominate the log volume.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        from django.conf import settings
+
+        self.get_response = get_response
+        self.health_paths = frozenset(settings.HEALTH_LIVENESS_PATHS) | frozenset(settings.HEALTH_READINESS_PATHS)
+        self.health_sample_rate = settings.ACCESS_LOG_HEALTH_SAMPLE_RATE
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token, started = self.begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id.reset(token)
+        self.finish(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        token, started = self.begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id.reset(token)
+        self.finish(request, response, started)
+        return response
+
+    def begin(self, request):
+        rid = (
+            request.headers.get('X-Request-ID')
+            or request.headers.get('X-Amzn-Trace-Id')
+            or uuid.uuid4().hex
+        )[:128]
+        request.request_id = rid
+        return request_id.set(rid), time.perf_counter()
+
+    def finish(self, request, response, started):
+        response['X-Request-ID'] = request.request_id
+        status = response.status_code
+        if (
+            status < 300
+            and request.path_info in self.health_paths
+            and random.random() >= self.health_sample_rate
+        ):
+            return
+        match = getattr(request, 'resolver_match', None)
+        access_logger.info(
+            '%s %s %s', request.method, request.get_full_path(), status,
+            extra={
+                'request_id': request.request_id,
+                'method': request.method,
+                'path': request.path_info,
+                'view': match.view_name if match else None,
+                'status': status,
+                'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+                'bytes': None if response.streaming else len(response.content),
+                'remote_addr': request.headers.get('X-Forwarded-For', request.META.get('REMOTE_ADDR')),
+                'user_agent': request.headers.get('User-Agent'),
+            },
+        )
@@ -0,0 +1,113 @@
+"""
+Django management command to measure password hashing cost on this task
+"""
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from config.cgroup import cpu_limit
+
+
+def suggest(name, hasher, ms_per_hash, target_ms):
+    """Cost parameters that would make one hash take about target_ms"""
+    ratio = target_ms / ms_per_hash
+    if name == 'pbkdf2':
+        return {'PASSWORD_PBKDF2_ITERATIONS': max(100_000, int(hasher.iterations * ratio // 10_000 * 10_000))}
+    if name == 'argon2':
+        return {'PASSWORD_ARGON2_TIME_COST': max(1, round(hasher.time_cost * ratio))}
+    if name == 'scrypt':
+        # Work factor must be a power of two
+        work_factor = 2 ** max(10, round(math.log2(hasher.work_factor * ratio)))
+        return {'PASSWORD_SCRYPT_WORK_FACTOR': work_factor}
+    return {}
+
+
+class Command(BaseCommand):
+    help = 'Measure hashes per second for each configured hasher and suggest cost settings for a target login latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher', action='append', choices=sorted(settings.PASSWORD_HASHER_CLASSES),
+            help='Hasher to benchmark (repeatable; default: all)',
+        )
+        parser.add_argument(
+            '--rounds', type=int, default=5,
+            help='Hashes per measurement (default: 5)',
+        )
+        parser.add_argument(
+            '--target-ms', type=float, default=100,
+            help='Desired CPU time per hash, used for the suggested settings (default: 100)',
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Print the results as JSON',
+        )
+
+    def handle(self, *args, **options):
+        names = options['hasher'] or list(settings.PASSWORD_HASHER_CLASSES)
+        rounds = options['rounds']
+        cpus = cpu_limit()
+        threads = max(1, math.ceil(cpus))
+        results = []
+
+        for name in names:
+            hasher = import_string(settings.PASSWORD_HASHER_CLASSES[name])()
+            try:
+                hasher.encode('warm-up', hasher.salt())
+            except ValueError as e:
+                # Missing optional library (argon2-cffi)
+                results.append({'hasher': name, 'error': str(e)})
+                continue
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                hasher.encode('benchmark-password', hasher.salt())
+            ms_per_hash = (time.perf_counter() - started) * 1000 / rounds
+
+            # Hashing releases the GIL, so concurrent logins on one worker use
+            # every CPU of the task
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(
+                    lambda _: hasher.encode('benchmark-password', hasher.salt()),
+                    range(rounds * threads),
+                ))
+            parallel_per_second = rounds * threads / (time.perf_counter() - started)
+
+            results.append({
+                'hasher': name,
+                'algorithm': hasher.algorithm,
+                'parameters': hasher.safe_summary(hasher.encode('x', hasher.salt())),
+                'ms_per_hash': round(ms_per_hash, 1),
+                'hashes_per_second_single': round(1000 / ms_per_hash, 1),
+                'hashes_per_second_task': round(parallel_per_second, 1),
+                'suggested_settings': suggest(name, hasher, ms_per_hash, options['target_ms']),
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {'cpus': cpus, 'active_hasher': settings.PASSWORD_HASHER, 'results': results},
+                indent=2, default=str,
+            ))
+            return
+
+        self.stdout.write(f"🔐 Password hashers on {cpus:.2f} CPUs (active: {settings.PASSWORD_HASHER})")
+        for result in results:
+            if 'error' in result:
+                self.stdout.write(self.style.WARNING(f"⚠️  {result['hasher']}: {result['error']}"))
+                continue
+            parameters = ', '.join(
+                f'{key}={value}' for key, value in result['parameters'].items()
+                if key not in ('algorithm', 'salt', 'hash')
+            )
+            self.stdout.write(
+                f"   {result['hasher']:<7} {result['ms_per_hash']:>8.1f} ms/hash | "
+                f"{result['hashes_per_second_task']:>7.1f} logins/s per task | {parameters}"
+            )
+            suggested = ' '.join(f'{key}={value}' for key, value in result['suggested_settings'].items())
+            self.stdout.write(f"           for ~{options['target_ms']:.0f} ms/hash: {suggested}")
@@ -0,0 +1,135 @@
+"""
+Django management command to prepare a container before it starts serving
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from config.locks import advisory_lock
+
+MIGRATION_LOCK = 'django-migrate'
+
+
+class Command(BaseCommand):
+    help = (
+        'Run startup checks concurrently, wait for the database with exponential '
+        'backoff and apply pending migrations once per deploy under an advisory lock'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--db-timeout', type=float, default=60,
+            help='Seconds to wait for the database to accept connections (default: 60)',
+        )
+        parser.add_argument(
+            '--migrate', action='store_true',
+            help='Apply pending migrations (only one task per deploy does the work)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        checks_to_run = {
+            'database': lambda: self.wait_for_database(options['db_timeout']),
+            'system checks': self.run_system_checks,
+            'cache': self.check_cache,
+            'static manifest': self.check_static_manifest,
+        }
+        # Critical checks abort startup; the rest only warn.
+        critical = {'database', 'system checks'}
+
+        with ThreadPoolExecutor(max_workers=len(checks_to_run)) as pool:
+            futures = {
+                name: pool.submit(self.in_thread, check)
+                for name, check in checks_to_run.items()
+            }
+
+        failed = False
+        for name, future in futures.items():
+            error = future.exception()
+            if error is None:
+                self.stdout.write(self.style.SUCCESS(f"✅ {name}: {future.result()}"))
+            elif name in critical:
+                failed = True
+                self.stdout.write(self.style.ERROR(f"❌ {name}: {error}"))
+            else:
+                self.stdout.write(self.style.WARNING(f"⚠️  {name}: {error}"))
+        if failed:
+            raise CommandError('Preflight checks failed')
+
+        if options['migrate']:
+            self.migrate()
+
+        self.stdout.write(f"⏱️  Preflight finished in {time.monotonic() - started:.2f}s")
+
+    def in_thread(self, check):
+        try:
+            return check()
+        finally:
+            # Each worker thread opened its own connections
+            connections.close_all()
+
+    def wait_for_database(self, timeout):
+        connection = connections[DEFAULT_DB_ALIAS]
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                connection.ensure_connection()
+                return f"connected to {connection.settings_dict.get('HOST') or connection.vendor} after {attempts} attempt(s)"
+            except Exception as e:
+                connection.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(f"database unavailable after {timeout:.0f}s: {e}") from e
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 5)
+
+    def run_system_checks(self):
+        # Database-tagged checks need the connection the other thread waits for
+        messages = checks.run_checks(include_deployment_checks=False, databases=None)
+        errors = [m for m in messages if m.is_serious() and not m.is_silenced()]
+        if errors:
+            raise CommandError('; '.join(str(m) for m in errors))
+        return f"{len(messages)} message(s), no errors"
+
+    def check_cache(self):
+        cache = caches['shared']
+        cache.set('preflight:probe', 1, 10)
+        if cache.get('preflight:probe') != 1:
+            raise CommandError('shared cache did not return the written value')
+        return type(cache).__name__
+
+    def check_static_manifest(self):
+        manifest = settings.STATIC_ROOT / 'staticfiles.json'
+        if not manifest.exists():
+            raise CommandError(f"{manifest} missing; run collectstatic")
+        return 'present'
+
+    def pending_migrations(self):
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        if not self.pending_migrations():
+            self.stdout.write(self.style.SUCCESS("✅ migrations: nothing pending, skipping"))
+            return
+
+        self.stdout.write("🔒 migrations: pending, waiting for the migration lock...")
+        with advisory_lock(MIGRATION_LOCK):
+            # Another task may have applied them while we waited
+            plan = self.pending_migrations()
+            if not plan:
+                self.stdout.write(self.style.SUCCESS("✅ migrations: applied by another task"))
+                return
+            self.stdout.write(f"📦 migrations: applying {len(plan)} migration(s)")
+            call_command('migrate', interactive=False, verbosity=1)
+        self.stdout.write(self.style.SUCCESS("✅ migrations: done"))
@@ -0,0 +1,157 @@
+"""
+Django management command to profile container boot time
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under -X importtime so that nothing is already
+# imported. Writes phase and per-app ready() timings as JSON to the file named
+# by its second argument: stdout also carries whatever the app logs.
+CHILD_SCRIPT = r'''
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.apps.config import AppConfig
+
+ready_ms = {}
+original_create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    app_config = original_create(cls, entry)
+    ready = app_config.ready
+    def timed_ready():
+        started = time.perf_counter()
+        ready()
+        ready_ms[app_config.label] = (time.perf_counter() - started) * 1000
+    app_config.ready = timed_ready
+    return app_config
+
+AppConfig.create = classmethod(timed_create)
+
+import django
+from django.conf import settings
+t_import = time.perf_counter()
+settings.INSTALLED_APPS  # force settings module import
+t_settings = time.perf_counter()
+django.setup()
+t_setup = time.perf_counter()
+from config.wsgi import application
+t_app = time.perf_counter()
+
+from django.test import Client
+response = Client().get(sys.argv[1])
+t_request = time.perf_counter()
+
+with open(sys.argv[2], 'w') as handle:
+    json.dump({
+        'phases_ms': {
+            'import_django': (t_import - t0) * 1000,
+            'load_settings': (t_settings - t_import) * 1000,
+            'django_setup': (t_setup - t_settings) * 1000,
+            'wsgi_application': (t_app - t_setup) * 1000,
+            'first_request': (t_request - t_app) * 1000,
+            'total': (t_request - t0) * 1000,
+        },
+        'first_request': {'path': sys.argv[1], 'status': response.status_code},
+        'app_ready_ms': ready_ms,
+    }, handle)
+'''
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth) tuples"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2].rstrip()
+        name = raw_name.lstrip()
+        depth = (len(raw_name) - len(name) - 1) // 2
+        rows.append((name, int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Profile boot time: import costs, per-app ready() timings and time to first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/admin/',
+            help='Path requested to measure time to first request (default: /admin/)',
+        )
+        parser.add_argument(
+            '--top', type=int, default=25,
+            help='Number of modules to include in each ranking (default: 25)',
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help='Write the JSON report to this file instead of stdout',
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            child_report = os.path.join(tmpdir, 'child.json')
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT, options['path'], child_report],
+                capture_output=True, text=True, env=os.environ.copy(),
+            )
+            wall_ms = (time.perf_counter() - started) * 1000
+            if result.returncode != 0:
+                raise CommandError(f"Profiled interpreter failed:\n{result.stderr[-4000:]}")
+            with open(child_report) as handle:
+                child = json.load(handle)
+
+        imports = parse_importtime(result.stderr)
+        top = options['top']
+
+        # Top-level packages (depth 0) carry the cost of everything they pull in
+        packages = {}
+        for name, _, cumulative_us, depth in imports:
+            if depth == 0:
+                root = name.split('.')[0]
+                packages[root] = packages.get(root, 0) + cumulative_us
+
+        report = {
+            'process_wall_ms': round(wall_ms, 1),
+            'phases_ms': {k: round(v, 1) for k, v in child['phases_ms'].items()},
+            'first_request': child['first_request'],
+            'app_ready_ms': dict(sorted(
+                ((label, round(ms, 2)) for label, ms in child['app_ready_ms'].items()),
+                key=lambda item: item[1], reverse=True,
+            )),
+            'imports': {
+                'count': len(imports),
+                'total_self_ms': round(sum(row[1] for row in imports) / 1000, 1),
+                'by_package_ms': [
+                    {'package': root, 'ms': round(us / 1000, 1)}
+                    for root, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+                ],
+                'by_cumulative_ms': [
+                    {'module': name, 'ms': round(cumulative_us / 1000, 1), 'depth': depth}
+                    for name, _, cumulative_us, depth in sorted(imports, key=lambda row: row[2], reverse=True)[:top]
+                ],
+                'by_self_ms': [
+                    {'module': name, 'ms': round(self_us / 1000, 2)}
+                    for name, self_us, _, _ in sorted(imports, key=lambda row: row[1], reverse=True)[:top]
+                ],
+            },
+        }
+
+        payload = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(payload)
+        else:
+            with open(options['output'], 'w') as handle:
+                handle.write(payload)
+            self.stdout.write(self.style.SUCCESS(f"✅ Startup profile written to {options['output']}"))
@@ -0,0 +1,109 @@
+"""
+Django management command to create the pg_trgm indexes behind admin and API search
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from config.locks import advisory_lock
+from config.search import INDEX_SUFFIX, search_targets
+
+
+class Command(BaseCommand):
+    help = 'Create (CONCURRENTLY) and repair the pg_trgm GIN indexes for admin and API search_fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to create the indexes on (default: default)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Print the statements without running them',
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Also drop *_trgm indexes no configured search field uses any more',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'postgresql':
+            self.stdout.write(
+                f"ℹ️  {connection.vendor} database: search falls back to icontains, no indexes to create"
+            )
+            return
+
+        targets = search_targets()
+        self.stdout.write(f"🔎 {len(targets)} searched text columns")
+
+        with advisory_lock('search-indexes', using=options['database'], wait=False) as acquired:
+            if not acquired:
+                self.stdout.write(self.style.WARNING('⚠️  Another task is building search indexes, skipping'))
+                return
+            self.sync(connection, targets, options)
+
+    def sync(self, connection, targets, options):
+        quote = connection.ops.quote_name
+        self.run_sql(connection, 'CREATE EXTENSION IF NOT EXISTS pg_trgm', options)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT c.relname, i.indisvalid FROM pg_index i '
+                'JOIN pg_class c ON c.oid = i.indexrelid '
+                'JOIN pg_am am ON am.oid = c.relam '
+                "WHERE am.amname = 'gin' AND c.relname LIKE %s "
+                'AND pg_catalog.pg_table_is_visible(c.oid)',
+                ['%' + INDEX_SUFFIX.replace('_', r'\_')],
+            )
+            existing = dict(cursor.fetchall())
+
+        created = repaired = 0
+        for name, (model, field) in sorted(targets.items()):
+            label = f'{model._meta.db_table}.{field.column}'
+            if existing.get(name):
+                self.stdout.write(f"   ✓ {label} ({name})")
+                continue
+            if name in existing:
+                # Left INVALID by an interrupted CREATE INDEX CONCURRENTLY:
+                # it costs writes but is never used, so build it again
+                self.stdout.write(self.style.WARNING(f"   ↻ {label}: {name} is invalid, rebuilding"))
+                self.run_sql(connection, f'DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}', options)
+                repaired += 1
+            else:
+                created += 1
+            self.run_sql(
+                connection,
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} '
+                f'ON {quote(model._meta.db_table)} USING gin ({quote(field.column)} gin_trgm_ops)',
+                options,
+            )
+
+        dropped = 0
+        if options['prune']:
+            for name in sorted(set(existing) - set(targets)):
+                self.run_sql(connection, f'DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}', options)
+                dropped += 1
+
+        verb = 'Would change' if options['dry_run'] else 'Changed'
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {verb}: {created} created, {repaired} rebuilt, {dropped} dropped, "
+            f"{len(targets) - created - repaired} up to date"
+        ))
+
+    def run_sql(self, connection, sql, options):
+        self.stdout.write(f"   {sql}")
+        if options['dry_run']:
+            return
+        started = time.monotonic()
+        try:
+            # CONCURRENTLY can't run inside a transaction block; management
+            # commands run in autocommit, so each statement stands alone
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+        except DatabaseError as exc:
+            hint = ' (creating pg_trgm needs CREATE on the database, or run it as a superuser once)' \
+                if 'EXTENSION' in sql else ''
+            raise CommandError(f"❌ {sql} failed: {exc}{hint}")
+        self.stdout.write(f"     {time.monotonic() - started:.1f}s")
@@ -0,0 +1,345 @@
+"""
+Per-request latency, database and cache instrumentation.
+
+MetricsMiddleware records, per resolved URL name, wall time, time spent in
+the database, query count, cache hits/misses and response size into
+fixed-bucket histograms held in the worker process. They are exported as:
+
+- Prometheus text on METRICS_PATH (per worker; the pid is a label), and/or
+- CloudWatch Embedded Metric Format lines on stdout every
+  METRICS_EMF_INTERVAL seconds, which awslogs ships and CloudWatch turns into
+  metrics without any API calls from the task.
+
+Health probes are answered by HealthCheckMiddleware before this middleware
+runs, so they are never measured.
+"""
+import bisect
+import contextvars
+import ipaddress
+import json
+import os
+import sys
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+from config.logging import dropped_records
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class RequestStats:
+    """Counters for the request being handled, reachable from any thread via current_request"""
+
+    __slots__ = ('db_ms', 'queries', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.db_ms = 0.0
+        self.queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+# Context variables follow the request into sync_to_async threads, so DB and
+# cache activity is attributed correctly under both WSGI and ASGI.
+current_request = contextvars.ContextVar('current_request_stats', default=None)
+
+
+def record_cache(hit):
+    stats = current_request.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+def instrument_query(execute, sql, params, many, context):
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_ms += (time.perf_counter() - started) * 1000
+        stats.queries += 1
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    # Equivalent to a permanent connection.execute_wrapper(); installed on
+    # every connection because connections are per thread and the request may
+    # run its queries on a different thread than the middleware (ASGI).
+    if instrument_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(instrument_query)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] is observations <= bounds[i], the last slot is +Inf"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self):
+        return list(self.counts), self.total, self.count
+
+
+class RouteMetrics:
+    __slots__ = ('latency_ms', 'db_ms', 'queries', 'response_bytes', 'statuses', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.db_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.statuses = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class Registry:
+    """All route metrics of this worker process"""
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, route, status, latency_ms, stats, size):
+        with self.lock:
+            metrics = self.routes.get(route)
+            if metrics is None:
+                metrics = self.routes[route] = RouteMetrics()
+            metrics.latency_ms.observe(latency_ms)
+            metrics.db_ms.observe(stats.db_ms)
+            metrics.queries.observe(stats.queries)
+            if size is not None:
+                metrics.response_bytes.observe(size)
+            status_class = f'{status // 100}xx'
+            metrics.statuses[status_class] = metrics.statuses.get(status_class, 0) + 1
+            metrics.cache_hits += stats.cache_hits
+            metrics.cache_misses += stats.cache_misses
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                route: {
+                    'latency_ms': m.latency_ms.snapshot(),
+                    'db_ms': m.db_ms.snapshot(),
+                    'queries': m.queries.snapshot(),
+                    'response_bytes': m.response_bytes.snapshot(),
+                    'statuses': dict(m.statuses),
+                    'cache_hits': m.cache_hits,
+                    'cache_misses': m.cache_misses,
+                }
+                for route, m in self.routes.items()
+            }
+
+
+registry = Registry()
+
+
+def render_prometheus(snapshot):
+    pid = os.getpid()
+    lines = []
+    histograms = (
+        ('latency_ms', 'http_request_duration_ms', LATENCY_BUCKETS_MS),
+        ('db_ms', 'http_request_db_duration_ms', LATENCY_BUCKETS_MS),
+        ('queries', 'http_request_db_queries', QUERY_BUCKETS),
+        ('response_bytes', 'http_response_size_bytes', SIZE_BUCKETS_BYTES),
+    )
+    for key, name, bounds in histograms:
+        lines.append(f'# TYPE {name} histogram')
+        for route, data in snapshot.items():
+            counts, total, count = data[key]
+            labels = f'route="{route}",pid="{pid}"'
+            cumulative = 0
+            for bound, bucket in zip(bounds, counts):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {total}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+    lines.append('# TYPE http_requests_total counter')
+    for route, data in snapshot.items():
+        for status_class, count in data['statuses'].items():
+            lines.append(f'http_requests_total{{route="{route}",status="{status_class}",pid="{pid}"}} {count}')
+    lines.append('# TYPE cache_requests_total counter')
+    for route, data in snapshot.items():
+        lines.append(f'cache_requests_total{{route="{route}",result="hit",pid="{pid}"}} {data["cache_hits"]}')
+        lines.append(f'cache_requests_total{{route="{route}",result="miss",pid="{pid}"}} {data["cache_misses"]}')
+    lines.append('# TYPE log_records_dropped_total counter')
+    lines.append(f'log_records_dropped_total{{pid="{pid}"}} {dropped_records()}')
+    return '\n'.join(lines) + '\n'
+
+
+class EMFExporter:
+    """Writes per-route deltas as CloudWatch Embedded Metric Format lines from a daemon thread"""
+
+    def __init__(self, interval, namespace):
+        self.interval = interval
+        self.namespace = namespace
+        self.previous = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.previous = {}
+            threading.Thread(target=self._run, name='metrics-emf', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                pass  # never let metrics export kill the worker
+
+    @staticmethod
+    def _values(bounds, counts, previous_counts):
+        # EMF accepts value/count pairs, so each bucket is reported at its upper bound
+        values, weights = [], []
+        upper = list(bounds) + [bounds[-1] * 2]
+        for index, count in enumerate(counts):
+            delta = count - (previous_counts[index] if previous_counts else 0)
+            if delta:
+                values.append(upper[index])
+                weights.append(delta)
+        return values, weights
+
+    def flush(self):
+        snapshot = registry.snapshot()
+        timestamp = int(time.time() * 1000)
+        lines = []
+        for route, data in snapshot.items():
+            previous = self.previous.get(route, {})
+            record = {'Route': route}
+            metric_defs = []
+            for key, name, unit, bounds in (
+                ('latency_ms', 'Latency', 'Milliseconds', LATENCY_BUCKETS_MS),
+                ('db_ms', 'DBTime', 'Milliseconds', LATENCY_BUCKETS_MS),
+                ('queries', 'DBQueries', 'Count', QUERY_BUCKETS),
+                ('response_bytes', 'ResponseSize', 'Bytes', SIZE_BUCKETS_BYTES),
+            ):
+                values, counts = self._values(bounds, data[key][0], previous.get(key, (None,))[0])
+                if values:
+                    record[name] = {'Values': values, 'Counts': counts}
+                    metric_defs.append({'Name': name, 'Unit': unit})
+            for key, name in (('cache_hits', 'CacheHits'), ('cache_misses', 'CacheMisses')):
+                delta = data[key] - previous.get(key, 0)
+                if delta:
+                    record[name] = delta
+                    metric_defs.append({'Name': name, 'Unit': 'Count'})
+            if not metric_defs:
+                continue
+            record['_aws'] = {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': self.namespace,
+                    'Dimensions': [['Route']],
+                    'Metrics': metric_defs,
+                }],
+            }
+            lines.append(json.dumps(record, separators=(',', ':')))
+        self.previous = snapshot
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
+
+
+class MetricsMiddleware:
+    """Measure each request and serve METRICS_PATH; see the module docstring"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.export = settings.METRICS_EXPORT
+        self.metrics_path = settings.METRICS_PATH
+        self.token = settings.METRICS_TOKEN
+        self.emf = None
+        if self.export in ('emf', 'both'):
+            self.emf = EMFExporter(settings.METRICS_EMF_INTERVAL, settings.METRICS_NAMESPACE)
+        connection_created.connect(install_query_wrapper, dispatch_uid='config.metrics')
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.path_info == self.metrics_path:
+            return self.metrics_view(request)
+        stats, token, started = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        if request.path_info == self.metrics_path:
+            return self.metrics_view(request)
+        stats, token, started = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    def begin(self):
+        if self.emf is not None:
+            self.emf.ensure_started()
+        stats = RequestStats()
+        return stats, current_request.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, started):
+        latency_ms = (time.perf_counter() - started) * 1000
+        match = request.resolver_match
+        route = (match.view_name or match.url_name) if match else '<unmatched>'
+        size = None if response.streaming else len(response.content)
+        registry.record(route, response.status_code, latency_ms, stats, size)
+
+    def metrics_view(self, request):
+        if self.export not in ('prometheus', 'both') or not self.allowed(request):
+            return HttpResponse(status=404)
+        return HttpResponse(
+            render_prometheus(registry.snapshot()),
+            content_type='text/plain; version=0.0.4',
+        )
+
+    def allowed(self, request):
+        # /admin/* is public behind the ALB: require the token, or a direct
+        # (not proxied) connection from a private address when no token is set.
+        if self.token:
+            return request.headers.get('Authorization') == f'Bearer {self.token}'
+        if 'x-forwarded-for' in request.headers:
+            return False
+        try:
+            return ipaddress.ip_address(request.META.get('REMOTE_ADDR', '')).is_private
+        except ValueError:
+            return False
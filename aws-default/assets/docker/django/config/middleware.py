@@ -1,29 +1,77 @@
 """
 Middleware to bypass certain checks for health check endpoint
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.http import HttpResponse
 
+from config.health import monitor
+
 
 class HealthCheckMiddleware:
     """
     Middleware that bypasses normal Django processing for health checks.
-    This ensures ALB target group health checks always get a quick 200 OK response.
-    
-    ALB sends: /admin/health/
-    This middleware intercepts it and returns 200 OK immediately.
+
+    Two tiers are served before any other middleware runs:
+
+    - Liveness (``HEALTH_LIVENESS_PATHS``): the process is up and serving.
+      Used by the container HEALTHCHECK; never touches dependencies.
+    - Readiness (``HEALTH_READINESS_PATHS``): database, cache and disk are
+      usable. Used by the ALB target group (/admin/health/). Probes run in a
+      background thread (see config.health) and the cached result is served,
+      so this never opens a DB connection on the request path.
+
+    Works natively under both WSGI and ASGI, so health probes never need a
+    thread from the sync pool.
     """
-    
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
-    
+        self.liveness_paths = frozenset(settings.HEALTH_LIVENESS_PATHS)
+        self.readiness_paths = frozenset(settings.HEALTH_READINESS_PATHS)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
     def __call__(self, request):
-        # Check if this is a health check request
-        path = request.path_info
-        
-        if path == '/admin/health/':
-            # Return immediate 200 OK for health checks
-            return HttpResponse("OK", status=200, content_type='text/plain')
-        
+        if self.is_async:
+            return self.__acall__(request)
+
+        response = self.health_response(request.path_info)
+        if response is not None:
+            return response
+
         # Normal request processing
         response = self.get_response(request)
         return response
+
+    async def __acall__(self, request):
+        response = self.health_response(request.path_info)
+        if response is not None:
+            return response
+        return await self.get_response(request)
+
+    def health_response(self, path):
+        if path in self.liveness_paths:
+            return HttpResponse("OK", status=200, content_type='text/plain')
+
+        if path in self.readiness_paths:
+            return self.readiness()
+
+        return None
+
+    def readiness(self):
+        monitor.ensure_started()
+        result = monitor.current()
+        if result is None:
+            return HttpResponse(
+                b'{"status": "starting"}', status=503, content_type='application/json'
+            )
+        return HttpResponse(
+            result.body,
+            status=200 if result.ready else 503,
+            content_type='application/json',
+        )
@@ -0,0 +1,233 @@
+"""
+N+1 detection, slow-query log and query budgets.
+
+Every request is timed query by query and any statement slower than
+SLOW_QUERY_MS is logged with the view name and a stack summary. A sample of
+requests (all of them under DEBUG, QUERY_INSPECT_SAMPLE_RATE in production)
+additionally fingerprints each statement; a fingerprint seen
+QUERY_REPEAT_THRESHOLD times or more in one request is logged as a suspected
+N+1, which is how admin changelists and DRF serializers usually regress.
+
+query_budget() declares the maximum number of queries a block or view may
+run. Exceeding it raises QueryBudgetExceeded (an AssertionError, so tests
+fail) when raise_on_exceed is set, and logs a warning otherwise:
+
+    with query_budget(5, raise_on_exceed=True):
+        client.get('/admin/auth/user/')
+"""
+import contextvars
+import functools
+import logging
+import os
+import random
+import re
+import time
+import traceback
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('config.querylog')
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fingerprint(sql):
+    """Normalise a statement so that queries differing only in parameters compare equal"""
+    sql = _LITERALS.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def stack_summary(limit=5):
+    """The innermost project frames (not Django, libraries or this module)"""
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(_PROJECT_ROOT)
+        and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(('querylog.py', 'metrics.py'))
+    ]
+    return [f'{os.path.relpath(f.filename, _PROJECT_ROOT)}:{f.lineno} in {f.name}' for f in frames[-limit:]]
+
+
+class QueryInspection:
+    """Statements seen during one request (or budget block)"""
+
+    __slots__ = ('sampled', 'view', 'counts', 'stacks', 'total')
+
+    def __init__(self, sampled, view=None):
+        self.sampled = sampled
+        self.view = view
+        self.counts = Counter()
+        self.stacks = {}
+        self.total = 0
+
+    def record(self, sql):
+        self.total += 1
+        if not self.sampled:
+            return
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if key not in self.stacks:
+            self.stacks[key] = stack_summary()
+
+    def repeated(self, threshold):
+        return [(sql, count) for sql, count in self.counts.most_common() if count >= threshold]
+
+
+current_inspection = contextvars.ContextVar('current_query_inspection', default=None)
+_budgets = contextvars.ContextVar('query_budgets', default=())
+# (budget, token, inspection) per query_budget entered in this context. Kept
+# here, not on the instance: one decorated view's budget is entered by every
+# concurrent request, each in its own thread or task context
+_entered = contextvars.ContextVar('query_budgets_entered', default=())
+
+
+def inspect_query(execute, sql, params, many, context):
+    inspection = current_inspection.get()
+    budgets = _budgets.get()
+    if inspection is None and not budgets:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if inspection is not None:
+            inspection.record(sql)
+        for budget in budgets:
+            budget.record(sql)
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            view = inspection.view if inspection is not None else None
+            logger.warning(
+                'Slow query (%.1f ms) in %s: %s\n  %s',
+                elapsed_ms, view or '-', fingerprint(sql)[:1000], '\n  '.join(stack_summary()),
+            )
+
+
+def _install_on(connection):
+    if inspect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_query)
+
+
+def install():
+    """Wrap connections opened from now on and those already open in this thread"""
+    connection_created.connect(
+        lambda sender, connection, **kwargs: _install_on(connection),
+        dispatch_uid='config.querylog', weak=False,
+    )
+    for connection in connections.all(initialized_only=True):
+        _install_on(connection)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget:
+    """Context manager and decorator (sync or async views) enforcing a maximum query count"""
+
+    def __init__(self, max_queries, raise_on_exceed=None):
+        self.max_queries = max_queries
+        self.raise_on_exceed = raise_on_exceed
+
+    def __enter__(self):
+        install()
+        inspection = QueryInspection(sampled=True)
+        token = _budgets.set(_budgets.get() + (inspection,))
+        _entered.set(_entered.get() + ((self, token, inspection),))
+        return inspection
+
+    def __exit__(self, exc_type, exc, tb):
+        entered = _entered.get()
+        index = max(i for i, entry in enumerate(entered) if entry[0] is self)
+        _, token, inspection = entered[index]
+        _entered.set(entered[:index] + entered[index + 1:])
+        _budgets.reset(token)
+        if exc_type is None and inspection.total > self.max_queries:
+            self.exceeded(inspection)
+        return False
+
+    def exceeded(self, inspection):
+        top = '\n'.join(f'  {count}x {sql[:300]}' for sql, count in inspection.counts.most_common(5))
+        message = f'{inspection.total} queries executed, budget is {self.max_queries}:\n{top}'
+        raise_on_exceed = self.raise_on_exceed
+        if raise_on_exceed is None:
+            raise_on_exceed = settings.QUERY_BUDGET_RAISE
+        if raise_on_exceed:
+            raise QueryBudgetExceeded(message)
+        logger.warning('Query budget exceeded: %s', message)
+
+    def __call__(self, func):
+        if iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self:
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class QueryInspectionMiddleware:
+    """Attach a QueryInspection to each request and report N+1 patterns when it ends"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.QUERY_INSPECT_SAMPLE_RATE
+        self.threshold = settings.QUERY_REPEAT_THRESHOLD
+        install()
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        inspection, token = self.begin()
+        try:
+            return self.get_response(request)
+        finally:
+            current_inspection.reset(token)
+            self.finish(request, inspection)
+
+    async def __acall__(self, request):
+        inspection, token = self.begin()
+        try:
+            return await self.get_response(request)
+        finally:
+            current_inspection.reset(token)
+            self.finish(request, inspection)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        inspection = current_inspection.get()
+        if inspection is not None and request.resolver_match:
+            inspection.view = request.resolver_match.view_name
+
+    def begin(self):
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        inspection = QueryInspection(sampled)
+        return inspection, current_inspection.set(inspection)
+
+    def finish(self, request, inspection):
+        if not inspection.sampled:
+            return
+        view = inspection.view or request.path_info
+        for sql, count in inspection.repeated(self.threshold):
+            logger.warning(
+                'Possible N+1 in %s: %d x %s\n  %s',
+                view, count, sql[:1000], '\n  '.join(inspection.stacks.get(sql, [])),
+            )
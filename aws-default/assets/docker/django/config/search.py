@@ -0,0 +1,160 @@
+"""
+Substring search served by pg_trgm GIN indexes.
+
+Django's icontains (admin search_fields, DRF SearchFilter) compiles to
+UPPER("col"::text) LIKE UPPER('%term%') on PostgreSQL, which no index can
+serve: every search is a sequential scan. The trgm_icontains lookup
+registered on text fields (see ConfigConfig.ready) compiles to
+"col" ILIKE '%term%' instead, which a GIN index with gin_trgm_ops answers
+for terms of three characters or more, with the same matches.
+
+- TrigramSearchMixin (added to every registered ModelAdmin by
+  enable_trigram_search()) and TrigramSearchFilter (DRF, the default filter
+  backend) rewrite plain text search_fields to trgm_icontains on
+  PostgreSQL. Prefixed fields (^, =, @, $), explicit lookups and other
+  databases (SQLite in development) keep Django's and DRF's behaviour.
+- `manage.py search_indexes` creates the indexes those search_fields need,
+  CONCURRENTLY, and rebuilds ones left invalid by an interrupted build.
+"""
+import hashlib
+
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, router
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.filters import SearchFilter
+
+SEARCH_PREFIXES = ('^', '=', '@', '$')
+INDEX_SUFFIX = '_trgm'
+
+
+class TrigramContains(IContains):
+    """Case-insensitive substring match that a gin_trgm_ops index can serve"""
+    lookup_name = 'trgm_icontains'
+
+    def as_sql(self, compiler, connection):
+        # Other databases: exactly what icontains generates
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        # IContains' rhs is already the escaped '%term%' pattern; the lhs is
+        # the bare column (no UPPER()/::text cast), so the index applies
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', (*lhs_params, *rhs_params)
+
+
+def register_lookups():
+    CharField.register_lookup(TrigramContains)
+    TextField.register_lookup(TrigramContains)
+
+
+def resolve_search_field(model, spec):
+    """The text field a plain search_fields entry matches with icontains, or None"""
+    if spec.startswith(SEARCH_PREFIXES):
+        return None
+    opts, field = model._meta, None
+    for part in spec.split('__'):
+        if part == 'pk':
+            part = opts.pk.name
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            # An explicit lookup ("name__iexact"): left as written
+            return None
+        if field.is_relation:
+            if not hasattr(field, 'path_infos'):
+                return None
+            opts = field.path_infos[-1].to_opts
+    if isinstance(field, (CharField, TextField)) and field.concrete:
+        return field
+    return None
+
+
+def uses_trigrams(model):
+    return connections[router.db_for_read(model)].vendor == 'postgresql'
+
+
+class TrigramSearchMixin:
+    """ModelAdmin mixin: search_fields use trgm_icontains on PostgreSQL"""
+
+    def get_search_fields(self, request):
+        search_fields = super().get_search_fields(request)
+        if not uses_trigrams(self.model):
+            return search_fields
+        return [
+            f'{spec}__{TrigramContains.lookup_name}' if resolve_search_field(self.model, spec) else spec
+            for spec in search_fields
+        ]
+
+
+class TrigramSearchFilter(SearchFilter):
+    """DRF SearchFilter using trgm_icontains for plain text fields on PostgreSQL"""
+
+    def construct_search(self, field_name, queryset):
+        if connections[queryset.db].vendor == 'postgresql' and resolve_search_field(queryset.model, field_name):
+            return f'{field_name}__{TrigramContains.lookup_name}'
+        return super().construct_search(field_name, queryset)
+
+
+def enable_trigram_search(site=admin.site):
+    """
+    Give every ModelAdmin registered on ``site`` TrigramSearchMixin, so stock
+    admins (GroupAdmin, third-party apps) use the indexes too. Called from
+    ConfigConfig.ready(), after the admin app has autodiscovered admin modules.
+    """
+    for model_admin in site._registry.values():
+        cls = type(model_admin)
+        if not isinstance(model_admin, TrigramSearchMixin):
+            model_admin.__class__ = type(cls.__name__, (TrigramSearchMixin, cls), {'__module__': cls.__module__})
+
+
+# Index management (manage.py search_indexes)
+
+def index_name(table, column):
+    """<table>_<column>_trgm, shortened with a hash to fit 63 characters"""
+    base = f'{table}_{column}'
+    limit = 63 - len(INDEX_SUFFIX)
+    if len(base) > limit:
+        digest = hashlib.md5(base.encode()).hexdigest()[:8]
+        base = f'{base[:limit - 9]}_{digest}'
+    return f'{base}{INDEX_SUFFIX}'
+
+
+def _api_views(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _api_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            # DRF's as_view() sets .cls, Django's sets .view_class
+            view = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+            if view is not None:
+                yield view
+
+
+def search_targets():
+    """{index name: (model, field)} for every searched text column"""
+    # Only admins and views that search with trgm_icontains: an index the
+    # others' UPPER(...) LIKE can't use would only slow down writes
+    sources = [
+        (model, model_admin.search_fields) for model, model_admin in admin.site._registry.items()
+        if isinstance(model_admin, TrigramSearchMixin)
+    ]
+    for view in _api_views(get_resolver().url_patterns):
+        queryset = getattr(view, 'queryset', None)
+        backends = getattr(view, 'filter_backends', ())
+        if (
+            queryset is not None and getattr(view, 'search_fields', None)
+            and any(issubclass(backend, TrigramSearchFilter) for backend in backends)
+        ):
+            sources.append((queryset.model, view.search_fields))
+
+    targets = {}
+    for model, search_fields in sources:
+        for spec in search_fields or ():
+            field = resolve_search_field(model, spec)
+            if field is not None:
+                targets[index_name(field.model._meta.db_table, field.column)] = (field.model, field)
+    return targets
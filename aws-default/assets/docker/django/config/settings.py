@@ -1,24 +1,26 @@
 # Django settings for Docker deployment
-import os
+#
+# Every environment variable is read, type-checked and validated once by
+# config.env.load_config(); a misconfiguration raises a single
+# ImproperlyConfigured listing every problem (`manage.py check_config` prints
+# them without starting anything). This module only maps that frozen Config
+# onto Django settings, so importing it has no side effects beyond that.
 from pathlib import Path
 
-# Try to import dj_database_url, fallback if not available
-try:
-    import dj_database_url
-    HAS_DJ_DATABASE_URL = True
-except ImportError:
-    HAS_DJ_DATABASE_URL = False
+from config.env import load_config
+
+CONFIG = load_config()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-change-me-in-production')
+SECRET_KEY = CONFIG.secret_key
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
+DEBUG = CONFIG.debug
 
-ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
+ALLOWED_HOSTS = list(CONFIG.allowed_hosts)
 
 # Application definition
 INSTALLED_APPS = [
@@ -34,15 +36,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'config.middleware.HealthCheckMiddleware',  # Health check bypass - MUST be first!
+    'config.logging.RequestLogMiddleware',  # Request ID and access log, sees health probes too
+    'config.middleware.HealthCheckMiddleware',  # Health check bypass - MUST come before the rest!
+    'config.metrics.MetricsMiddleware',  # Latency/DB/cache metrics, after health so probes aren't counted
+    'config.querylog.QueryInspectionMiddleware',  # Slow-query log and N+1 detection
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    # Session, CSRF, auth and messages are skipped for stateless routes
+    # (STATELESS_PATH_PREFIXES and @stateless views, see config.stateless)
+    'config.stateless.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'config.stateless.CsrfViewMiddleware',
+    'config.stateless.AuthenticationMiddleware',
+    'config.stateless.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -65,98 +72,249 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
-# Database configuration with fallback logic
-DATABASE_URL = os.environ.get('DATABASE_URL')
-
-# Individual DB variables
-DB_HOST = os.environ.get('DB_HOST')
-DB_NAME = os.environ.get('DB_NAME')
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_PORT = os.environ.get('DB_PORT', '5432')
-
-# Initialize DATABASES variable
-DATABASES = None
-
-if DATABASE_URL and HAS_DJ_DATABASE_URL:
-    try:
-        parsed_db = dj_database_url.parse(DATABASE_URL, conn_max_age=600, conn_health_checks=True)
-        # Ensure SSL preferences are set for production
-        if 'OPTIONS' not in parsed_db:
-            parsed_db['OPTIONS'] = {}
-        parsed_db['OPTIONS']['sslmode'] = 'prefer'
-        DATABASES = {
-            'default': parsed_db
-        }
-    except Exception:
-        DATABASES = None  # Force fallback to manual parsing
-
-if DATABASE_URL and DATABASES is None:
-    # Manual parsing of DATABASE_URL if dj_database_url failed
-    import re
-    match = re.match(r'postgresql://([^:]+):([^@]+)@([^:]+):(\d+)/(.+)', DATABASE_URL)
-    if match:
-        user, password, host, port, dbname = match.groups()
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.postgresql',
-                'NAME': dbname,
-                'USER': user,
-                'PASSWORD': password,
-                'HOST': host,
-                'PORT': port,
-                'OPTIONS': {
-                    'connect_timeout': 10,
-                    'sslmode': 'prefer',  # Prefer SSL but don't require it
-                },
-            }
-        }
-    else:
-        # Try simpler regex patterns
-        simple_match = re.match(r'postgres://([^:]+):([^@]+)@([^:]+):(\d+)/(.+)', DATABASE_URL)
-        if simple_match:
-            user, password, host, port, dbname = simple_match.groups()
-            DATABASES = {
-                'default': {
-                    'ENGINE': 'django.db.backends.postgresql',
-                    'NAME': dbname,
-                    'USER': user,
-                    'PASSWORD': password,
-                    'HOST': host,
-                    'PORT': port,
-                    'OPTIONS': {
-                        'connect_timeout': 10,
-                        'sslmode': 'prefer',  # Prefer SSL but don't require it
-                    },
-                }
-            }
-            
-if DATABASES is None:
-    # Fallback to individual components  
-    if DB_NAME and DB_USER and DB_PASSWORD and DB_HOST:
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.postgresql',
-                'NAME': DB_NAME,
-                'USER': DB_USER,
-                'PASSWORD': DB_PASSWORD,
-                'HOST': DB_HOST,
-                'PORT': DB_PORT,
-                'OPTIONS': {
-                    'connect_timeout': 10,
-                    'sslmode': 'prefer',  # Prefer SSL but don't require it
-                },
-            }
+# How the container serves requests (see entrypoint.sh `serve`):
+#   gthread - gunicorn sync workers with threads, config.wsgi
+#   uvicorn - gunicorn with uvicorn workers, config.asgi
+SERVER_MODE = CONFIG.server_mode
+
+# Database: DATABASE_URL (parsed once by config.env), else DB_HOST/DB_NAME/
+# DB_USER/DB_PASSWORD/DB_PORT, else SQLite for local development.
+DATABASES = {
+    'default': CONFIG.database.as_setting(),
+}
+
+# Connection lifetime / pooling, applied the same way whichever branch above
+# produced the configuration.
+#
+# Default: persistent connections (CONN_MAX_AGE) with health checks.
+# DB_POOL=true: psycopg3 connection pool (Django 5.1+ OPTIONS['pool']). Each
+# worker process keeps between DB_POOL_MIN_SIZE and DB_POOL_MAX_SIZE
+# connections shared by its threads, recycled after DB_POOL_MAX_LIFETIME and
+# closed after DB_POOL_MAX_IDLE seconds unused. Idle connections are verified
+# every DB_POOL_CHECK_INTERVAL seconds by the health monitor (config.health),
+# and DB_POOL_CHECK_ON_CHECKOUT=true additionally pings on every checkout.
+DB_CONN_MAX_AGE = CONFIG.db_conn_max_age
+# Persistent connections don't work under ASGI (each request may run on a
+# different thread), so uvicorn mode pools by default.
+DB_POOL = CONFIG.db_pool
+DB_POOL_MIN_SIZE = CONFIG.db_pool_min_size
+DB_POOL_MAX_SIZE = CONFIG.db_pool_max_size
+DB_POOL_MAX_LIFETIME = CONFIG.db_pool_max_lifetime
+DB_POOL_MAX_IDLE = CONFIG.db_pool_max_idle
+DB_POOL_TIMEOUT = CONFIG.db_pool_timeout
+DB_POOL_CHECK_INTERVAL = CONFIG.db_pool_check_interval
+DB_POOL_CHECK_ON_CHECKOUT = CONFIG.db_pool_check_on_checkout
+
+
+def configure_connection(db):
+    """Apply persistent-connection or pool settings to a DATABASES entry"""
+    if db['ENGINE'] != 'django.db.backends.postgresql':
+        return db
+    options = db.setdefault('OPTIONS', {})
+    options.setdefault('connect_timeout', 10)
+    if DB_POOL:
+        pool = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'max_lifetime': DB_POOL_MAX_LIFETIME,
+            'max_idle': DB_POOL_MAX_IDLE,
+            'timeout': DB_POOL_TIMEOUT,
         }
+        options['pool'] = pool
+        # The pool owns connection lifetime; Django rejects persistent
+        # connections in pooled mode. CONN_HEALTH_CHECKS maps to the pool's
+        # check-on-checkout callback.
+        db['CONN_MAX_AGE'] = 0
+        db['CONN_HEALTH_CHECKS'] = DB_POOL_CHECK_ON_CHECKOUT
     else:
-        # No valid database configuration found, use SQLite for local development
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.sqlite3',
-                'NAME': BASE_DIR / 'db.sqlite3',
-            }
-        }
+        db['CONN_MAX_AGE'] = DB_CONN_MAX_AGE if SERVER_MODE != 'uvicorn' else 0
+        db['CONN_HEALTH_CHECKS'] = True
+    return db
+
+
+configure_connection(DATABASES['default'])
+
+# Read replica (Aurora reader endpoint). When DATABASE_READ_URL is set, reads
+# go to the 'replica' alias via config.db_router.ReplicaRouter. A request is
+# pinned to the writer once it writes (and for REPLICA_PIN_SECONDS afterwards
+# via a cookie, so redirect-after-POST sees its own writes), and reads fall
+# back to the writer while the replica is down or lags more than
+# REPLICA_MAX_LAG_SECONDS behind.
+REPLICA_MAX_LAG_SECONDS = CONFIG.replica_max_lag_seconds
+REPLICA_PIN_SECONDS = CONFIG.replica_pin_seconds
+REPLICA_PIN_COOKIE = 'db_pin'
+DATABASE_ROUTERS = []
+
+if CONFIG.replica_database:
+    replica_db = CONFIG.replica_database.as_setting()
+    replica_db['TEST'] = {'MIRROR': 'default'}
+    DATABASES['replica'] = configure_connection(replica_db)
+    DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('config.middleware.HealthCheckMiddleware') + 1,
+        'config.db_router.ReplicaPinningMiddleware',
+    )
+
+# Cache (see config.cache). With REDIS_URL the default cache is two-tiered:
+# a bounded per-process LocMem tier (LRU, CACHE_LOCAL_TIMEOUT seconds) in
+# front of Redis shared by the whole fleet. Without Redis it is a bounded
+# LocMem cache per process.
+# REDIS_AUTH_TOKEN (ElastiCache AUTH) is folded into REDIS_LOCATION by config.env.
+REDIS_URL = CONFIG.redis_url
+REDIS_LOCATION = CONFIG.redis_location
+CACHE_DEFAULT_TIMEOUT = CONFIG.cache_default_timeout
+CACHE_LOCAL_TIMEOUT = CONFIG.cache_local_timeout
+CACHE_LOCAL_MAX_ENTRIES = CONFIG.cache_local_max_entries
+CACHE_KEY_PREFIX = CONFIG.cache_key_prefix
+# pickle (any Python object) or json (JSON-safe values only, smaller)
+CACHE_SERIALIZER = CONFIG.cache_serializer
+# Payloads at least this large are zlib-compressed; 0 disables compression
+CACHE_COMPRESS_MIN_BYTES = CONFIG.cache_compress_min_bytes
+# Default lifetime for per-view caching (config.cache.CachedViewMixin, api_root)
+CACHE_VIEW_TIMEOUT = CONFIG.cache_view_timeout
+# Cache-Control for conditional GET views (config.conditional): browsers
+# revalidate with If-None-Match after HTTP_CACHE_MAX_AGE (0 = every time, a
+# cheap 304), CloudFront serves public responses for HTTP_CACHE_SHARED_MAX_AGE
+HTTP_CACHE_MAX_AGE = CONFIG.http_cache_max_age
+HTTP_CACHE_SHARED_MAX_AGE = CONFIG.http_cache_shared_max_age
+
+CACHES = {
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'local',
+        'TIMEOUT': CACHE_LOCAL_TIMEOUT,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'OPTIONS': {'MAX_ENTRIES': CACHE_LOCAL_MAX_ENTRIES, 'CULL_FREQUENCY': 4},
+    },
+}
+
+if REDIS_URL:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_LOCATION,
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'OPTIONS': {
+            'serializer': (
+                'config.cache.CompressedJSONSerializer'
+                if CACHE_SERIALIZER == 'json'
+                else 'config.cache.CompressedPickleSerializer'
+            ),
+            'socket_connect_timeout': 2,
+            'socket_timeout': 2,
+            'health_check_interval': 30,
+        },
+    }
+    CACHES['default'] = {
+        'BACKEND': 'config.cache.TieredCache',
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        'OPTIONS': {
+            'LOCAL': 'local',
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': CACHE_LOCAL_TIMEOUT,
+        },
+    }
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'OPTIONS': {'MAX_ENTRIES': CACHE_LOCAL_MAX_ENTRIES * 10},
+    }
+    CACHES['default'] = CACHES['shared']
+
+# Sessions. SESSION_BACKEND selects the engine:
+#   db              - django_session table on every request (Django default)
+#   cached_db       - read from Redis, write-through to the DB (durable)
+#   cache           - Redis only; sessions are lost if Redis is flushed
+#   signed_cookies  - stored client-side, no server lookup at all
+# The cache-based engines use the 'shared' alias and require REDIS_URL, since
+# per-process caches would give each worker its own view of a session.
+# Expired DB rows are removed with `manage.py purge_sessions`.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_BACKEND = CONFIG.session_backend
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'shared'
+
+# Authentication cache (see config.auth), opt-in. The user row and flattened
+# permissions are kept in 'shared' for AUTH_CACHE_TIMEOUT seconds and
+# invalidated by signals, so warm requests make no auth queries. Sessions
+# created before it was enabled keep working and move to the cached backend.
+AUTH_CACHE = CONFIG.auth_cache
+AUTH_CACHE_TIMEOUT = CONFIG.auth_cache_timeout
+if AUTH_CACHE:
+    AUTHENTICATION_BACKENDS = [
+        'config.auth.CachedModelBackend',
+        'django.contrib.auth.backends.ModelBackend',
+    ]
+    MIDDLEWARE[MIDDLEWARE.index('config.stateless.AuthenticationMiddleware')] = (
+        'config.auth.CachedAuthenticationMiddleware'
+    )
+
+# Celery (see config.celery / config.tasks), using Redis as the broker. Without
+# REDIS_URL tasks run inline, so local development needs no worker. Worker
+# concurrency and prefetch are sized from the cgroup limits in config.celery.
+CELERY_BROKER_URL = REDIS_LOCATION if REDIS_URL else 'memory://'
+CELERY_TASK_ALWAYS_EAGER = not REDIS_URL
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+# Progress and results that matter are written to the 'shared' cache or the
+# database by the task itself; a result backend would only add Redis writes.
+CELERY_TASK_IGNORE_RESULT = True
+# Acknowledge after the task finishes, so a task interrupted by an ECS stop
+# (SIGTERM, then SIGKILL) is redelivered instead of lost. Tasks must be idempotent.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    # Must exceed the longest task, or Redis redelivers it while it still runs
+    'visibility_timeout': CONFIG.celery_visibility_timeout,
+}
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+CELERY_TASK_TIME_LIMIT = CONFIG.celery_task_time_limit
+CELERY_TASK_SOFT_TIME_LIMIT = CONFIG.celery_task_soft_time_limit
+# Recycle worker processes periodically, like gunicorn's max_requests
+CELERY_WORKER_MAX_TASKS_PER_CHILD = CONFIG.celery_worker_max_tasks_per_child
+CELERY_WORKER_HIJACK_ROOT_LOGGER = False
+# Items per task for config.tasks.batch_task / delay_in_chunks
+CELERY_BATCH_SIZE = CONFIG.celery_batch_size
+CELERY_BEAT_SCHEDULE = {
+    'purge-expired-sessions': {
+        'task': 'config.tasks.purge_expired_sessions',
+        'schedule': 3600.0,
+    },
+}
+
+# Password hashing (see config.hashers). PASSWORD_HASHER picks the algorithm
+# for new hashes; the others stay listed so existing hashes still verify and
+# are upgraded on the user's next login. Cost settings left unset keep
+# Django's defaults; size them with `manage.py benchmark_hashers`.
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'config.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'config.hashers.TunableArgon2PasswordHasher',
+    'scrypt': 'config.hashers.TunableScryptPasswordHasher',
+}
+PASSWORD_HASHER = CONFIG.password_hasher
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = CONFIG.password_pbkdf2_iterations
+PASSWORD_ARGON2_TIME_COST = CONFIG.password_argon2_time_cost
+PASSWORD_ARGON2_MEMORY_COST = CONFIG.password_argon2_memory_cost  # KiB
+PASSWORD_ARGON2_PARALLELISM = CONFIG.password_argon2_parallelism
+PASSWORD_SCRYPT_WORK_FACTOR = CONFIG.password_scrypt_work_factor
+PASSWORD_SCRYPT_BLOCK_SIZE = CONFIG.password_scrypt_block_size
+PASSWORD_SCRYPT_PARALLELISM = CONFIG.password_scrypt_parallelism
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -183,24 +341,38 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # STATIC_URL includes /admin prefix for proper routing through ALB
 # ALB forwards /admin/static/* to Django, Django serves from STATIC_ROOT
-STATIC_URL = os.getenv('DJANGO_STATIC_URL', '/admin/static/')
+STATIC_URL = CONFIG.static_url
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Additional static file handling for WhiteNoise
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# (STATICFILES_STORAGE was removed in Django 5.1; STORAGES replaces it)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Collect static files into subdirectories
 STATICFILES_DIRS = []
 
 # WhiteNoise settings for better admin static files serving
-WHITENOISE_USE_FINDERS = True
+# In production WhiteNoise serves only the collected tree from the image build:
+# hashed names get "Cache-Control: max-age=315360000, public, immutable" and
+# the precompressed .br/.gz variants are picked by Accept-Encoding. Finders
+# (unhashed, scanned at startup) are only used in DEBUG.
+WHITENOISE_USE_FINDERS = DEBUG
 WHITENOISE_AUTOREFRESH = DEBUG
+# Unhashed files (e.g. referenced without {% static %}) may change per deploy
+WHITENOISE_MAX_AGE = CONFIG.whitenoise_max_age if not DEBUG else 0
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Port configuration (for gunicorn or development server)
-PORT = int(os.environ.get('PORT', 8080))
+PORT = CONFIG.port
 
 # Security settings for production
 if not DEBUG:
@@ -239,23 +411,149 @@ else:
 CORS_ALLOW_ALL_ORIGINS = True
 
 # REST Framework
+# API defaults (see config.api): keyset pagination with a bounded page size,
+# orjson rendering and throttles shared by all workers through 'shared'.
+API_PAGE_SIZE = CONFIG.api_page_size
+API_MAX_PAGE_SIZE = CONFIG.api_max_page_size
+# Rows fetched per server-side cursor round trip by streaming exports
+API_EXPORT_CHUNK_SIZE = CONFIG.api_export_chunk_size
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'config.api.KeysetPagination',
+    'PAGE_SIZE': API_PAGE_SIZE,
+    # SearchFilter that uses pg_trgm indexes on PostgreSQL (config/search.py;
+    # create them with `manage.py search_indexes`), plain icontains elsewhere
+    'DEFAULT_FILTER_BACKENDS': [
+        'config.search.TrigramSearchFilter',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.api.ORJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_THROTTLE_CLASSES': [
+        'config.api.SharedAnonRateThrottle',
+        'config.api.SharedUserRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': CONFIG.api_throttle_anon,
+        'user': CONFIG.api_throttle_user,
+    },
 }
 
-# Logging
+# Admin changelists built on config.changelist.LargeTableAdmin show Postgres'
+# planner estimates instead of running COUNT(*) once a table (or filtered
+# result) is estimated to have at least this many rows; 0 always counts.
+ADMIN_COUNT_ESTIMATE_THRESHOLD = CONFIG.admin_count_estimate_threshold
+
+# Bulk admin actions (config.bulk) work through the selection this many
+# primary keys at a time; selections larger than the threshold run as a
+# Celery job with progress in the 'shared' cache (0 never hands off). Without
+# REDIS_URL there is no broker or shared cache: every selection is applied in
+# the request, which stops after ADMIN_BULK_INLINE_TIME_LIMIT seconds (keep it
+# under GUNICORN_TIMEOUT).
+ADMIN_BULK_CHUNK_SIZE = CONFIG.admin_bulk_chunk_size
+ADMIN_BULK_BACKGROUND_THRESHOLD = CONFIG.admin_bulk_background_threshold
+ADMIN_BULK_INLINE_TIME_LIMIT = CONFIG.admin_bulk_inline_time_limit
+
+# Error reporting. sentry_sdk is heavy to import (it pulls in integrations for
+# every framework it detects), so it is only imported when a DSN is set.
+SENTRY_DSN = CONFIG.sentry_dsn
+if SENTRY_DSN:
+    import sentry_sdk
+
+    sentry_sdk.init(
+        dsn=SENTRY_DSN,
+        environment=CONFIG.sentry_environment,
+        traces_sample_rate=CONFIG.sentry_traces_sample_rate,
+        # Only the integrations this service uses, instead of probing every
+        # installed package at boot
+        auto_enabling_integrations=False,
+    )
+
+# Health checks (see config.health / config.middleware.HealthCheckMiddleware)
+# Liveness: process is up (container HEALTHCHECK). Readiness: dependencies are
+# usable (ALB target group). /admin/health/ is what the ALB probes.
+HEALTH_LIVENESS_PATHS = ['/admin/health/live/']
+HEALTH_READINESS_PATHS = ['/admin/health/', '/admin/health/ready/']
+HEALTH_CHECK_INTERVAL = CONFIG.health_check_interval
+HEALTH_DISK_MIN_FREE_MB = CONFIG.health_disk_min_free_mb
+
+# Request metrics (see config.metrics). METRICS_EXPORT selects the exporter:
+# prometheus (text on METRICS_PATH), emf (CloudWatch Embedded Metric Format
+# lines on stdout), both, or off (still measured, nothing exported).
+METRICS_EXPORT = CONFIG.metrics_export
+METRICS_PATH = '/admin/metrics/'
+# Bearer token for METRICS_PATH; without it only direct private-network
+# scrapes (no X-Forwarded-For, i.e. not through the ALB) are answered
+METRICS_TOKEN = CONFIG.metrics_token
+METRICS_EMF_INTERVAL = CONFIG.metrics_emf_interval
+METRICS_NAMESPACE = CONFIG.metrics_namespace
+
+# Stateless routes (see config.stateless): requests under these prefixes, and
+# to views marked @stateless, skip the session, CSRF, auth and messages
+# middleware. STATELESS_PATH_PREFIXES from the environment adds to the list.
+STATELESS_PATH_PREFIXES = [
+    STATIC_URL,
+    METRICS_PATH,
+    *HEALTH_LIVENESS_PATHS,
+    *HEALTH_READINESS_PATHS,
+    *CONFIG.stateless_path_prefixes,
+]
+
+# Query inspection (see config.querylog). Slow queries are logged on every
+# request; fingerprinting for N+1 detection runs on every request under DEBUG
+# and on a sample in production.
+SLOW_QUERY_MS = CONFIG.slow_query_ms
+QUERY_INSPECT_SAMPLE_RATE = CONFIG.query_inspect_sample_rate
+QUERY_REPEAT_THRESHOLD = CONFIG.query_repeat_threshold
+# Whether a view over its query_budget() raises instead of logging
+QUERY_BUDGET_RAISE = CONFIG.query_budget_raise
+
+# Logging (see config.logging): records are queued on the request path and
+# written as single-line JSON by a background thread. LOG_QUEUE_SIZE bounds
+# the queue; records beyond it are dropped and counted, never waited for.
+LOG_LEVEL = CONFIG.log_level
+LOG_QUEUE_SIZE = CONFIG.log_queue_size
+# Fraction of successful health-check requests written to the access log
+ACCESS_LOG_HEALTH_SAMPLE_RATE = CONFIG.access_log_health_sample_rate
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'config.logging.JSONFormatter',
+        },
+    },
+    'filters': {
+        'health_probes': {
+            '()': 'config.logging.HealthProbeFilter',
+            'paths': [*HEALTH_LIVENESS_PATHS, *HEALTH_READINESS_PATHS],
+        },
+    },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
+        'queue': {
+            '()': 'config.logging.AsyncQueueHandler',
+            'maxsize': LOG_QUEUE_SIZE,
+            'formatter': 'json',
         },
     },
     'root': {
-        'handlers': ['console'],
-        'level': 'INFO',
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        # Replace Django's own console handler so nothing bypasses the queue
+        'django': {
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        # Readiness 503s are expected while starting or degraded; not errors
+        'django.request': {
+            'filters': ['health_probes'],
+        },
     },
 }
@@ -0,0 +1,157 @@
+"""
+Stateless routes: requests that skip the session, CSRF, auth and messages middleware.
+
+Static files, metrics, the API root and similar endpoints never read a
+session or a user, yet every request to them went through SessionMiddleware,
+CsrfViewMiddleware (cookie parsing, Vary: Cookie), AuthenticationMiddleware
+and MessageMiddleware. A route is stateless when:
+
+- its path starts with one of STATELESS_PATH_PREFIXES, or
+- it resolves to a view marked with @stateless whose URL pattern has no
+  converters (use a prefix for parametrised routes).
+
+The table is built once, when the middleware is loaded at startup. Each
+request costs one set lookup plus a walk of a path-segment trie, done once and
+kept on the request. The middleware below replace Django's classes in
+MIDDLEWARE and hand stateless requests straight to the next layer. Those
+requests get an AnonymousUser and have no request.session or messages
+storage.
+"""
+import functools
+import logging
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware as DjangoAuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware as DjangoMessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware as DjangoSessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware as DjangoCsrfViewMiddleware
+from django.urls import URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+
+logger = logging.getLogger(__name__)
+
+STATELESS_ATTR = 'stateless'
+_END = object()
+
+
+def stateless(view):
+    """Mark a view function or class as never using the session, CSRF, request.user or messages"""
+    setattr(view, STATELESS_ATTR, True)
+    return view
+
+
+def _segments(path):
+    return path.strip('/').split('/')
+
+
+class PathTable:
+    """Exact paths and path prefixes (whole segments) matched against request.path_info"""
+
+    def __init__(self, exact=(), prefixes=()):
+        self.exact = frozenset(exact)
+        self.trie = {}
+        for prefix in prefixes:
+            node = self.trie
+            for segment in _segments(prefix):
+                if segment:
+                    node = node.setdefault(segment, {})
+            node[_END] = True
+
+    def __contains__(self, path):
+        if path in self.exact:
+            return True
+        node = self.trie
+        if _END in node:
+            return True
+        for segment in _segments(path):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+
+def _is_marked(callback):
+    # @stateless on a function view, or on the class behind as_view()
+    view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    return getattr(callback, STATELESS_ATTR, False) or getattr(view_class, STATELESS_ATTR, False)
+
+
+def _marked_paths(patterns, prefix='/', literal=True):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        # Only converter-free path() routes map to a single request path
+        is_literal = literal and isinstance(pattern.pattern, RoutePattern) and not pattern.pattern.converters
+        if isinstance(pattern, URLResolver):
+            yield from _marked_paths(pattern.url_patterns, route, is_literal)
+        elif _is_marked(pattern.callback):
+            if is_literal:
+                yield route
+            else:
+                logger.warning(
+                    'Stateless view %s has URL parameters (%s); list a prefix in '
+                    'STATELESS_PATH_PREFIXES for it instead', pattern.lookup_str, route,
+                )
+
+
+@functools.cache
+def stateless_routes():
+    return PathTable(
+        exact=_marked_paths(get_resolver().url_patterns),
+        prefixes=settings.STATELESS_PATH_PREFIXES,
+    )
+
+
+def is_stateless(request):
+    try:
+        return request.stateless
+    except AttributeError:
+        request.stateless = request.path_info in stateless_routes()
+        return request.stateless
+
+
+class StatelessSkipMixin:
+    """Skip a MiddlewareMixin-based middleware entirely for stateless requests"""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # Build the table at startup, not on the first request
+        stateless_routes()
+
+    def __call__(self, request):
+        if is_stateless(request):
+            self.skipped(request)
+            # A coroutine under ASGI, which the caller awaits
+            return self.get_response(request)
+        return super().__call__(request)
+
+    def skipped(self, request):
+        pass
+
+
+class SessionMiddleware(StatelessSkipMixin, DjangoSessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(StatelessSkipMixin, DjangoCsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # Called by the handler directly, so it needs its own check
+        if is_stateless(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(StatelessSkipMixin, DjangoAuthenticationMiddleware):
+    def skipped(self, request):
+        request.user = AnonymousUser()
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+
+
+class MessageMiddleware(StatelessSkipMixin, DjangoMessageMiddleware):
+    pass
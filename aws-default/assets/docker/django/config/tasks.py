@@ -0,0 +1,85 @@
+"""
+Celery tasks and batching helpers.
+
+Enqueuing one task per row (one email, one update) costs a broker round trip
+and a DB transaction per item. batch_task() turns a function taking a *list*
+of items into a task, and its .delay_many(items) enqueues one task per chunk
+of CELERY_BATCH_SIZE items, after the current transaction commits:
+
+    @batch_task()
+    def deactivate_users(user_ids):
+        User.objects.filter(pk__in=user_ids).update(is_active=False)
+
+    deactivate_users.delay_many(ids)   # len(ids) / CELERY_BATCH_SIZE tasks
+
+Inside a task, bulk_update_in_chunks() writes model changes with one
+bulk_update() per chunk.
+"""
+import functools
+from itertools import islice
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import transaction
+
+from config.bulk import run_job
+from config.celery import app
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def delay_in_chunks(task, items, chunk_size=None, on_commit=True, **kwargs):
+    """Enqueue ``task(chunk, **kwargs)`` per chunk of items; returns the number of tasks"""
+    chunk_size = chunk_size or settings.CELERY_BATCH_SIZE
+    chunks = list(chunked(items, chunk_size))
+
+    def enqueue():
+        for chunk in chunks:
+            task.delay(chunk, **kwargs)
+
+    if on_commit:
+        # Workers must not pick up a chunk before the rows it refers to exist
+        transaction.on_commit(enqueue)
+    else:
+        enqueue()
+    return len(chunks)
+
+
+def batch_task(chunk_size=None, **task_options):
+    """Register a function over a list of items as a task with a .delay_many() helper"""
+    def decorator(func):
+        task = app.task(**task_options)(func)
+        task.delay_many = functools.partial(delay_in_chunks, task, chunk_size=chunk_size)
+        return task
+    return decorator
+
+
+def bulk_update_in_chunks(objects, fields, chunk_size=None):
+    """bulk_update() a list of model instances one chunk (and transaction) at a time"""
+    if not objects:
+        return 0
+    chunk_size = chunk_size or settings.CELERY_BATCH_SIZE
+    manager = type(objects[0])._default_manager
+    updated = 0
+    for chunk in chunked(objects, chunk_size):
+        with transaction.atomic():
+            updated += manager.bulk_update(chunk, fields)
+    return updated
+
+
+@app.task
+def purge_expired_sessions():
+    """Scheduled by beat (CELERY_BEAT_SCHEDULE); see the purge_sessions command"""
+    call_command('purge_sessions')
+
+
+@app.task
+def run_bulk_job(job_id, query):
+    """Bulk admin action over a large selection (config.bulk), re-enqueued until done"""
+    if not run_job(job_id, query):
+        run_bulk_job.delay(job_id, query)
@@ -0,0 +1,49 @@
+import io
+import json
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from config.auth import CachedModelBackend
+
+User = get_user_model()
+
+
+@override_settings(AUTH_CACHE=True, AUTH_CACHE_TIMEOUT=300)
+class ProvisionInvalidationTests(TestCase):
+    """provision_users writes without signals, so it must drop cached users itself"""
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.user = User.objects.create_user('ops', 'ops@example.com', 'pw', is_staff=True, is_superuser=True)
+        self.backend = CachedModelBackend()
+        # Cache the entry, superuser and all
+        self.assertTrue(self.backend.get_user(self.user.pk).is_superuser)
+
+    def provision(self, users):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as handle:
+            json.dump(users, handle)
+            handle.flush()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('provision_users', handle.name, '--force', stdout=io.StringIO())
+
+    def test_demotion_takes_effect_immediately(self):
+        self.provision([{'username': 'ops', 'is_superuser': False, 'is_staff': False}])
+        user = self.backend.get_user(self.user.pk)
+        self.assertFalse(user.is_superuser)
+        self.assertFalse(user.is_staff)
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.provision([{'username': 'ops', 'is_active': False}])
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_group_membership_takes_effect_immediately(self):
+        self.assertEqual(self.backend.get_user(self.user.pk).groups.count(), 0)
+        self.provision({'groups': [{'name': 'auditors', 'permissions': ['auth.view_user']}], 'users': [
+            {'username': 'ops', 'is_superuser': False, 'groups': ['auditors']},
+        ]})
+        user = self.backend.get_user(self.user.pk)
+        self.assertEqual(self.backend.get_group_permissions(user), {'auth.view_user'})
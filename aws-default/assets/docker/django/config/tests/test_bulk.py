@@ -0,0 +1,59 @@
+import itertools
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config import bulk
+
+User = get_user_model()
+
+
+@override_settings(REDIS_URL='', CELERY_TASK_ALWAYS_EAGER=True, ADMIN_BULK_BACKGROUND_THRESHOLD=2, ADMIN_BULK_CHUNK_SIZE=2)
+class InlineBulkActionTests(TestCase):
+    """Without a broker every selection is applied in the request, within a time limit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('root', 'root@example.com', 'pw')
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(5)])
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+        self.url = reverse('admin:auth_user_changelist')
+        self.selection = list(User.objects.exclude(pk=self.admin_user.pk).values_list('pk', flat=True))
+
+    def deactivate(self):
+        return self.client.post(self.url, {
+            'action': 'deactivate_selected',
+            '_selected_action': self.selection,
+        })
+
+    def test_no_background_threshold(self):
+        self.assertEqual(bulk.background_threshold(), 0)
+        model_admin = admin.site._registry[User]
+        self.assertEqual(model_admin.selection_size(User.objects.all()), 6)
+
+    def test_large_selection_runs_in_request(self):
+        with mock.patch.object(bulk, 'start_job') as start_job:
+            response = self.deactivate()
+        start_job.assert_not_called()
+        self.assertFalse(User.objects.filter(pk__in=self.selection, is_active=True).exists())
+        self.assertIn('5 users', str(list(get_messages(response.wsgi_request))[-1]))
+
+    @override_settings(ADMIN_BULK_INLINE_TIME_LIMIT=1)
+    def test_stops_at_time_limit(self):
+        # The clock passes the deadline during the first chunk
+        clock = itertools.chain([0], itertools.repeat(100))
+        with mock.patch.object(bulk, 'time') as time:
+            time.monotonic.side_effect = lambda: next(clock)
+            response = self.deactivate()
+        self.assertEqual(User.objects.filter(pk__in=self.selection, is_active=False).count(), 2)
+        self.assertIn('stopped after 2 users', str(list(get_messages(response.wsgi_request))[-1]))
+
+    @override_settings(REDIS_URL='redis://cache.invalid:6379/0', CELERY_TASK_ALWAYS_EAGER=False)
+    def test_background_with_broker(self):
+        self.assertEqual(bulk.background_threshold(), 2)
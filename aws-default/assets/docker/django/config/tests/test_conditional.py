@@ -0,0 +1,91 @@
+from django.contrib.auth.models import Group
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.conditional import ConditionalViewMixin, bump_version, conditional, version_etag
+
+
+@conditional(etag=version_etag('test:items'), max_age=0, shared_max_age=0)
+def items(request):
+    return HttpResponse('items')
+
+
+class VersionEtagTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(REDIS_URL='')
+    def test_no_etag_without_redis(self):
+        # 'shared' is per-process LocMem: another worker's bump would be missed
+        response = items(self.factory.get('/items/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+        response = items(self.factory.get('/items/', HTTP_IF_NONE_MATCH='*'))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(REDIS_URL='redis://cache.invalid:6379/0')
+    def test_etag_and_304_with_redis(self):
+        etag = items(self.factory.get('/items/'))['ETag']
+
+        response = items(self.factory.get('/items/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+
+        bump_version('test:items')
+        response = items(self.factory.get('/items/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(REDIS_URL='')
+    def test_model_etag_without_redis(self):
+        etag = version_etag(Group)
+        self.assertIsNone(etag(self.factory.get('/groups/')))
+
+
+class ConditionalViewMixinTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def view(self, **attrs):
+        class ItemsView(ConditionalViewMixin, APIView):
+            etag_versions = ('test:items',)
+            permission_classes = [IsAuthenticated]
+            authentication_classes = []
+
+            def get(self, request):
+                return Response({'items': []})
+
+        for name, value in attrs.items():
+            setattr(ItemsView, name, value)
+        return ItemsView.as_view()
+
+    @override_settings(REDIS_URL='redis://cache.invalid:6379/0')
+    def test_permission_checked_before_304(self):
+        view = self.view()
+        response = view(self.factory.get('/items/', HTTP_IF_NONE_MATCH='*'))
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(REDIS_URL='redis://cache.invalid:6379/0')
+    def test_304_when_allowed(self):
+        view = self.view(permission_classes=[AllowAny])
+        response = view(self.factory.get('/items/'))
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+        response = view(self.factory.get('/items/', HTTP_IF_NONE_MATCH=response['ETag']))
+        self.assertEqual(response.status_code, 304)
+
+        response = view(self.factory.head('/items/', HTTP_IF_NONE_MATCH=response['ETag']))
+        self.assertEqual(response.status_code, 304)
+
+
+class ApiRootTests(SimpleTestCase):
+    def test_no_expires_next_to_max_age(self):
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=0', response['Cache-Control'])
+        self.assertFalse(response.has_header('Expires'))
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config import db_router
+from config.db_router import REPLICA, WRITER, ReplicaPinningMiddleware, ReplicaRouter
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_PIN_COOKIE='db_pin', REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        patcher = mock.patch.object(db_router, 'monitor')
+        self.monitor = patcher.start()
+        self.addCleanup(patcher.stop)
+        state = mock.patch.multiple(db_router.replica_state, available=True, lag_seconds=0.0)
+        state.start()
+        self.addCleanup(state.stop)
+
+    def test_unknown_lag_uses_writer(self):
+        db_router.replica_state.available = False
+        db_router.replica_state.lag_seconds = None
+        self.assertEqual(self.router.db_for_read(User), WRITER)
+        self.monitor.ensure_started.assert_called_once()
+
+    def test_write_outside_request_does_not_pin(self):
+        # A Celery task or management command: nothing would ever unpin it
+        self.router.db_for_write(User)
+        self.assertEqual(self.router.db_for_read(User), REPLICA)
+
+    def test_write_pins_only_for_the_request(self):
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(User))
+            self.router.db_for_write(User)
+            reads.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        response = ReplicaPinningMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(reads, [REPLICA, WRITER])
+        self.assertIn('db_pin', response.cookies)
+        self.assertEqual(self.router.db_for_read(User), REPLICA)
@@ -0,0 +1,30 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+User = get_user_model()
+
+
+@override_settings(AUTH_CACHE=False)
+class ProvisionStampTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+
+    def ensure_superuser(self):
+        stdout = io.StringIO()
+        call_command('ensure_superuser', stdout=stdout)
+        return stdout.getvalue()
+
+    def test_unchanged_input_is_skipped(self):
+        self.ensure_superuser()
+        self.assertIn('nothing to do', self.ensure_superuser())
+
+    def test_stamp_not_trusted_after_database_reset(self):
+        self.ensure_superuser()
+        # The database is reset while the shared cache (Redis) keeps the stamp
+        User.objects.all().delete()
+        self.assertNotIn('nothing to do', self.ensure_superuser())
+        self.assertTrue(User.objects.filter(username='admin', is_superuser=True).exists())
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse, HttpResponse
@@ -6,8 +9,12 @@ from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.conf.urls.static import static
 
+from config.conditional import conditional
+from config.exports import UserExportView
+from config.stateless import stateless
+
 @csrf_exempt
-def health_check(request):
+async def health_check(request):
     """
     Health check endpoint for ALB target groups.
     Returns 200 OK without authentication or CSRF validation.
@@ -17,19 +24,28 @@ def health_check(request):
         return HttpResponse("OK", status=200, content_type='text/plain')
     return HttpResponse("Method Not Allowed", status=405)
 
-@require_http_methods(["GET"])
-def api_root(request):
+API_ROOT = {
+    "message": "Django Admin is running",
+    "endpoints": {
+        "admin": "/admin/",
+    }
+}
+# The body only changes with a deploy, so its hash is a free, stable ETag
+API_ROOT_ETAG = hashlib.md5(json.dumps(API_ROOT, sort_keys=True).encode()).hexdigest()
+
+@stateless
+@require_http_methods(["GET", "HEAD"])
+# No cache_page: its Expires would contradict conditional()'s max-age, and
+# the constant body costs nothing to build
+@conditional(etag=API_ROOT_ETAG)
+async def api_root(request):
     """API root endpoint"""
-    return JsonResponse({
-        "message": "Django Admin is running",
-        "endpoints": {
-            "admin": "/admin/",
-        }
-    })
+    return JsonResponse(API_ROOT)
 
 urlpatterns = [
     path('admin/health/', health_check, name='health-check'),
     path('admin/admin/', admin.site.urls),
+    path('admin/api/users/export/', UserExportView.as_view(), name='user-export'),
     path('admin/', api_root, name='api-root'),
 ]
 
@@ -85,7 +85,7 @@ echo "🌐 Web Server Test:"
 echo "------------------"
 
 if command -v curl >/dev/null 2>&1; then
-    if curl -f http://localhost:8080/api/health/ 2>/dev/null >/dev/null; then
+    if curl -f http://localhost:8080/admin/health/live/ 2>/dev/null >/dev/null; then
         echo "✅ Health endpoint is responding"
     else
         echo "❌ Health endpoint is not responding"
@@ -0,0 +1,94 @@
+"""
+Gunicorn configuration sized from the container's cgroup limits.
+
+Every value can be overridden with an environment variable, so right-sizing
+the ECS task (cpu/memory in resources.json) doesn't require a new image:
+
+    GUNICORN_WORKERS, GUNICORN_THREADS, GUNICORN_WORKER_MEMORY_MB,
+    GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER, GUNICORN_TIMEOUT,
+    GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE, GUNICORN_PRELOAD, PORT
+
+SERVER_MODE=gthread serves config.wsgi with threaded workers;
+SERVER_MODE=uvicorn serves config.asgi with uvicorn workers.
+
+The application's environment is validated (config.env) when this file is
+loaded, so a misconfiguration stops the master with every error listed
+instead of crash-looping workers after they fork.
+"""
+import math
+import os
+
+from config.cgroup import cpu_limit, env_int, memory_limit_mb
+from config.env import load_config
+
+app_config = load_config()
+server_mode = app_config.server_mode
+cpus = cpu_limit()
+memory_mb = memory_limit_mb()
+
+# Workers: threaded workers spend most of their time waiting on Postgres, so
+# two per CPU keeps the cores busy; an event loop saturates a core on its own.
+if server_mode == 'uvicorn':
+    default_workers = max(1, math.ceil(cpus))
+else:
+    default_workers = max(2, math.ceil(cpus) * 2)
+
+# ...but never more than fit in memory, keeping 20% headroom for the master,
+# page cache and spikes.
+worker_memory_mb = env_int('GUNICORN_WORKER_MEMORY_MB', 256)
+if memory_mb:
+    default_workers = max(1, min(default_workers, int(memory_mb * 0.8) // worker_memory_mb))
+
+workers = env_int('GUNICORN_WORKERS', default_workers)
+
+if server_mode == 'uvicorn':
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    wsgi_app = 'config.asgi:application'
+else:
+    worker_class = 'gthread'
+    wsgi_app = 'config.wsgi:application'
+    threads = env_int('GUNICORN_THREADS', 4)
+
+bind = f'0.0.0.0:{app_config.port}'
+
+# Recycle workers periodically to bound slow leaks; the jitter keeps them from
+# all restarting at the same moment.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Must exceed the ALB idle timeout (60s) or the ALB reuses closed connections
+# and returns 502s.
+keepalive = env_int('GUNICORN_KEEPALIVE', 75)
+
+# Import Django once in the master so workers share its memory copy-on-write
+# and fork faster.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+# Heartbeat files on tmpfs; a slow overlay filesystem can make the arbiter
+# kill healthy workers.
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Access logging is done by config.logging.RequestLogMiddleware (JSON, with
+# request IDs, sampled health checks) off the request thread.
+accesslog = None
+errorlog = '-'
+
+
+def when_ready(server):
+    server.log.info(
+        'Sized for %.2f CPUs / %s MB: %s %s workers%s, max_requests=%s±%s',
+        cpus, memory_mb or 'unlimited', workers, worker_class,
+        f' x {threads} threads' if server_mode != 'uvicorn' else '',
+        max_requests, max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    # Nothing should have connected in the master, but never share sockets
+    # across processes.
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
@@ -3,7 +3,6 @@
 
 import os
 import sys
-from pathlib import Path
 
 # Add the current directory to Python path
 sys.path.insert(0, '/app')
@@ -16,53 +15,38 @@ print("=" * 50)
 
 print("\n📍 Environment Variables:")
 print(f"DJANGO_SETTINGS_MODULE: {os.environ.get('DJANGO_SETTINGS_MODULE')}")
-print(f"DATABASE_URL: {os.environ.get('DATABASE_URL')}")
+print(f"DATABASE_URL: {'***set***' if os.environ.get('DATABASE_URL') else 'not set'}")
 
-# Import and check our actual settings module
-print("\n📍 Importing settings module directly:")
+# Step 1 parses the environment exactly as settings do (every error at once),
+# without importing Django settings
+print("\n📍 Step 1: Parsing the environment (config.env):")
+from config.env import ConfigError, load_config
+
+try:
+    config = load_config()
+except ConfigError as e:
+    print(f"   ❌ {e}")
+    sys.exit(1)
+
+print("   ✅ Configuration is valid")
+print(f"   DEBUG: {config.debug}")
+print(f"   Database: {config.database.describe()} (from {config.database.source})")
+for warning in config.warnings:
+    print(f"   ⚠️  {warning}")
+
+# Step 2 imports the settings module once; it reuses the parse from step 1
+print("\n📍 Step 2: Importing config.settings:")
 try:
-    # Import directly with a fresh import (no Django setup)
-    print("   Step 1: Trying to import config.settings...")
     import config.settings as settings_module
-    
-    print(f"✅ Config.settings module imported")
-    print(f"   Settings module file: {settings_module.__file__}")
-    print(f"   Has DATABASES: {hasattr(settings_module, 'DATABASES')}")
-    
-    # List all attributes to see what's actually available
-    print(f"   All attributes: {[attr for attr in dir(settings_module) if not attr.startswith('_')]}")
-    
-    if hasattr(settings_module, 'DATABASES'):
-        databases = settings_module.DATABASES
-        print(f"   DATABASES type: {type(databases)}")
-        print(f"   DATABASES content: {databases}")
-        
-        if databases and isinstance(databases, dict):
-            default_db = databases.get('default', {})
-            if default_db:
-                print(f"   Engine: {default_db.get('ENGINE', 'NOT SET')}")
-                print(f"   Name: {default_db.get('NAME', 'NOT SET')}")
-                print(f"   Host: {default_db.get('HOST', 'NOT SET')}")
-    else:
-        print("   ❌ DATABASES attribute not found in settings module")
-        
-    # Check what variables are set
-    print(f"   Has SECRET_KEY: {hasattr(settings_module, 'SECRET_KEY')}")
-    print(f"   Has DEBUG: {hasattr(settings_module, 'DEBUG')}")
-    print(f"   DEBUG value: {getattr(settings_module, 'DEBUG', 'NOT SET')}")
-    
-    # Try to reload the module to see if it executes print statements
-    print("   Step 2: Reloading module...")
-    import importlib
-    importlib.reload(settings_module)
-    print("   ✅ Module reloaded successfully")
 
-except ImportError as e:
-    print(f"   ❌ ImportError loading config.settings: {e}")
-    import traceback
-    traceback.print_exc()
+    default_db = settings_module.DATABASES['default']
+    print(f"   ✅ Settings module imported: {settings_module.__file__}")
+    print(f"   Same Config object: {settings_module.CONFIG is config}")
+    print(f"   Engine: {default_db['ENGINE']}")
+    print(f"   Name: {default_db['NAME']}")
+    print(f"   Host: {default_db['HOST'] or 'N/A'}")
 except Exception as e:
-    print(f"   ❌ Runtime error in config.settings: {e}")
+    print(f"   ❌ Error in config.settings: {e}")
     print(f"   Error type: {type(e).__name__}")
     import traceback
     traceback.print_exc()
@@ -0,0 +1,14 @@
+#!/bin/bash
+# Print the hash identifying a collectstatic result: the requirements (which
+# pin the admin/DRF assets) plus every app static source file. The Dockerfile
+# writes it to /app/.collectstatic-stamp after collectstatic; entrypoint.sh
+# skips collectstatic only while it still matches.
+
+set -e
+cd "$(dirname "$0")"
+
+{
+    sha256sum requirements.txt
+    find . -path ./staticfiles -prune -o -type f -path '*/static/*' -print \
+        | LC_ALL=C sort | xargs -r sha256sum
+} | sha256sum | cut -d ' ' -f 1
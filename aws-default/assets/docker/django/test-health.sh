@@ -35,15 +35,15 @@ echo ""
 echo "🧪 Testing health check endpoints:"
 echo ""
 
-echo "1️⃣  Test: /admin/health/ (what ALB sends)"
+echo "1️⃣  Test: /admin/health/ (readiness, what ALB sends)"
 curl -s -o /dev/null -w "   Status: %{http_code}\n" http://localhost:$PORT/admin/health/
 curl -s http://localhost:$PORT/admin/health/
 echo ""
 echo ""
 
-echo "2️⃣  Test: /health/ (without prefix)"
-curl -s -o /dev/null -w "   Status: %{http_code}\n" http://localhost:$PORT/health/
-curl -s http://localhost:$PORT/health/
+echo "2️⃣  Test: /admin/health/live/ (container liveness)"
+curl -s -o /dev/null -w "   Status: %{http_code}\n" http://localhost:$PORT/admin/health/live/
+curl -s http://localhost:$PORT/admin/health/live/
 echo ""
 echo ""
 
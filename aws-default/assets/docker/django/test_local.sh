@@ -62,7 +62,7 @@ docker logs $CONTAINER_ID
 
 echo ""
 echo "Testing health endpoint:"
-curl -f http://localhost:8080/api/health/ || echo "Health check failed"
+curl -f http://localhost:8080/admin/health/live/ || echo "Health check failed"
 
 echo ""
 echo "Cleaning up..."
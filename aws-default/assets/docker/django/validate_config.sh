@@ -133,10 +133,10 @@ else
     echo "❌ ECS service should use port 8080"
 fi
 
-if grep -q '"healthCheckPath": "/api/health/"' infrastructure.dev.json; then
+if grep -q '"healthCheckPath": "/admin/health/"' infrastructure.dev.json; then
     echo "✅ Health check path is correct"
 else
-    echo "❌ Health check should use /api/health/ endpoint"
+    echo "❌ Health check should use /admin/health/ (readiness) endpoint"
 fi
 
 if grep -q 'DATABASE_URL' infrastructure.dev.json; then